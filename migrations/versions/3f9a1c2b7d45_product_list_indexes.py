@@ -0,0 +1,41 @@
+"""product list indexes
+
+Revision ID: 3f9a1c2b7d45
+Revises: c1ee46cf8706
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2b7d45'
+down_revision: Union[str, Sequence[str], None] = 'c1ee46cf8706'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_product_name_id', 'product', ['name', 'id'], unique=False)
+    op.create_index('ix_product_quantity_id', 'product', ['quantity', 'id'], unique=False)
+    op.create_index('ix_product_category_id_id', 'product', ['category_id', 'id'], unique=False)
+    op.create_index(
+        'ix_product_name_pattern',
+        'product',
+        ['name'],
+        unique=False,
+        postgresql_ops={'name': 'varchar_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_name_pattern', table_name='product')
+    op.drop_index('ix_product_category_id_id', table_name='product')
+    op.drop_index('ix_product_quantity_id', table_name='product')
+    op.drop_index('ix_product_name_id', table_name='product')
@@ -0,0 +1,56 @@
+"""sale
+
+Revision ID: 5b6e2d83f1c4
+Revises: d4a8f61c2e97
+Create Date: 2026-10-18 14:31:48.205117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b6e2d83f1c4'
+down_revision: Union[str, Sequence[str], None] = 'd4a8f61c2e97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sale',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('total', sa.Numeric(), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_sale_created_by'), 'sale', ['created_by'], unique=False)
+    op.create_table(
+        'sale_item',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sale_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('unit_cost', sa.Numeric(), nullable=False),
+        sa.Column('unit_price', sa.Numeric(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['product.id'], ),
+        sa.ForeignKeyConstraint(['sale_id'], ['sale.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_sale_item_product_id'), 'sale_item', ['product_id'], unique=False)
+    op.create_index(op.f('ix_sale_item_sale_id'), 'sale_item', ['sale_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sale_item_sale_id'), table_name='sale_item')
+    op.drop_index(op.f('ix_sale_item_product_id'), table_name='sale_item')
+    op.drop_table('sale_item')
+    op.drop_index(op.f('ix_sale_created_by'), table_name='sale')
+    op.drop_table('sale')
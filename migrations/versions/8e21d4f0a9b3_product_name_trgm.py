@@ -0,0 +1,38 @@
+"""product name trgm
+
+Revision ID: 8e21d4f0a9b3
+Revises: 3f9a1c2b7d45
+Create Date: 2026-10-18 11:47:05.902716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e21d4f0a9b3'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c2b7d45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_product_name_trgm',
+        'product',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_name_trgm', table_name='product')
+    # A extensão pg_trgm é mantida: pode estar em uso por outros objetos
@@ -0,0 +1,32 @@
+"""product fk indexes
+
+Revision ID: d4a8f61c2e97
+Revises: b7c3e9a15d20
+Create Date: 2026-10-18 13:52:10.664018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8f61c2e97'
+down_revision: Union[str, Sequence[str], None] = 'b7c3e9a15d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # category_id já é coberta por ix_product_category_id_id (category_id, id)
+    op.create_index(op.f('ix_product_created_by'), 'product', ['created_by'], unique=False)
+    op.create_index(op.f('ix_product_updated_by'), 'product', ['updated_by'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_product_updated_by'), table_name='product')
+    op.drop_index(op.f('ix_product_created_by'), table_name='product')
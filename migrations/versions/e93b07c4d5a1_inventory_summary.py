@@ -0,0 +1,143 @@
+"""inventory summary
+
+Revision ID: e93b07c4d5a1
+Revises: 5b6e2d83f1c4
+Create Date: 2026-10-18 15:20:37.551842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93b07c4d5a1'
+down_revision: Union[str, Sequence[str], None] = '5b6e2d83f1c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Registra em inventory_delta a soma das variações (por categoria) de cada
+# comando na tabela product. Triggers por comando com transition tables:
+# uma importação de milhares de linhas gera uma linha por categoria. Só
+# inserções: escritas concorrentes na mesma categoria não disputam uma
+# linha de resumo. `starphone_api.inventory` compacta as variações em
+# inventory_summary periodicamente.
+INSERT_DELTAS = """
+    INSERT INTO inventory_delta
+        (category_id, product_count, total_units, total_cost, total_profit)
+    SELECT category_id, sum(product_count), sum(total_units), sum(total_cost), sum(total_profit)
+    FROM ({rows}) AS delta
+    GROUP BY category_id
+    HAVING sum(product_count) <> 0 OR sum(total_units) <> 0
+        OR sum(total_cost) <> 0 OR sum(total_profit) <> 0;
+"""
+
+NEW_ROWS = """
+    SELECT category_id, 1 AS product_count, quantity AS total_units,
+           cost_value * quantity AS total_cost, profit_value * quantity AS total_profit
+    FROM new_rows
+"""
+
+OLD_ROWS = """
+    SELECT category_id, -1 AS product_count, -quantity AS total_units,
+           -(cost_value * quantity) AS total_cost, -(profit_value * quantity) AS total_profit
+    FROM old_rows
+"""
+
+# Em UPDATE só contam as linhas em que algum valor do resumo mudou: carimbar
+# change_seq ou updated_by (renomear categoria ou usuário) não gera variação
+CHANGED = """
+    (n.category_id, n.quantity, n.cost_value, n.profit_value)
+        IS DISTINCT FROM (o.category_id, o.quantity, o.cost_value, o.profit_value)
+"""
+
+UPDATED_ROWS = f"""
+    SELECT n.category_id, 1 AS product_count, n.quantity AS total_units,
+           n.cost_value * n.quantity AS total_cost, n.profit_value * n.quantity AS total_profit
+    FROM new_rows n JOIN old_rows o USING (id)
+    WHERE {CHANGED}
+    UNION ALL
+    SELECT o.category_id, -1 AS product_count, -o.quantity AS total_units,
+           -(o.cost_value * o.quantity) AS total_cost, -(o.profit_value * o.quantity) AS total_profit
+    FROM new_rows n JOIN old_rows o USING (id)
+    WHERE {CHANGED}
+"""
+
+APPLY_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION inventory_summary_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {INSERT_DELTAS.format(rows=NEW_ROWS)}
+    ELSIF TG_OP = 'DELETE' THEN
+        {INSERT_DELTAS.format(rows=OLD_ROWS)}
+    ELSE
+        {INSERT_DELTAS.format(rows=UPDATED_ROWS)}
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+REBUILD = """
+INSERT INTO inventory_summary
+    (category_id, product_count, total_units, total_cost, total_profit)
+SELECT category_id, count(*), sum(quantity), sum(cost_value * quantity), sum(profit_value * quantity)
+FROM product
+GROUP BY category_id;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'inventory_summary',
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('product_count', sa.Integer(), nullable=False),
+        sa.Column('total_units', sa.Integer(), nullable=False),
+        sa.Column('total_cost', sa.Numeric(), nullable=False),
+        sa.Column('total_profit', sa.Numeric(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['category.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('category_id'),
+    )
+    op.create_table(
+        'inventory_delta',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('product_count', sa.Integer(), nullable=False),
+        sa.Column('total_units', sa.Integer(), nullable=False),
+        sa.Column('total_cost', sa.Numeric(), nullable=False),
+        sa.Column('total_profit', sa.Numeric(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['category.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute(APPLY_FUNCTION)
+    op.execute(
+        'CREATE TRIGGER product_inventory_insert AFTER INSERT ON product '
+        'REFERENCING NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION inventory_summary_apply()'
+    )
+    op.execute(
+        'CREATE TRIGGER product_inventory_update AFTER UPDATE ON product '
+        'REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION inventory_summary_apply()'
+    )
+    op.execute(
+        'CREATE TRIGGER product_inventory_delete AFTER DELETE ON product '
+        'REFERENCING OLD TABLE AS old_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION inventory_summary_apply()'
+    )
+    op.execute(REBUILD)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS product_inventory_delete ON product')
+    op.execute('DROP TRIGGER IF EXISTS product_inventory_update ON product')
+    op.execute('DROP TRIGGER IF EXISTS product_inventory_insert ON product')
+    op.execute('DROP FUNCTION IF EXISTS inventory_summary_apply()')
+    op.drop_table('inventory_delta')
+    op.drop_table('inventory_summary')
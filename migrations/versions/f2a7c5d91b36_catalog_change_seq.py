@@ -0,0 +1,60 @@
+"""catalog change seq
+
+Revision ID: f2a7c5d91b36
+Revises: e93b07c4d5a1
+Create Date: 2026-10-18 17:42:09.836215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c5d91b36'
+down_revision: Union[str, Sequence[str], None] = 'e93b07c4d5a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Linhas existentes entram na versão atual do catálogo: a primeira
+# sincronização (since=0) devolve todas elas
+STAMP_CURRENT_VERSION = "UPDATE {table} SET change_seq = (SELECT version FROM catalog_version WHERE id = 1)"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('product', 'category'):
+        op.add_column(
+            table,
+            sa.Column('change_seq', sa.Integer(), nullable=False, server_default='0'),
+        )
+        op.execute(STAMP_CURRENT_VERSION.format(table=table))
+        op.alter_column(table, 'change_seq', server_default=None)
+        op.create_index(f'ix_{table}_change_seq', table, ['change_seq'], unique=False)
+
+    # Usuários só recebem change_seq quando o nome ou o email mudam
+    op.add_column('user', sa.Column('change_seq', sa.Integer(), nullable=True))
+    op.create_index('ix_user_change_seq', 'user', ['change_seq'], unique=False)
+
+    op.create_table(
+        'catalog_tombstone',
+        sa.Column('entity', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('change_seq', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('entity', 'entity_id'),
+    )
+    op.create_index('ix_catalog_tombstone_change_seq', 'catalog_tombstone', ['change_seq'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_catalog_tombstone_change_seq', table_name='catalog_tombstone')
+    op.drop_table('catalog_tombstone')
+    op.drop_index('ix_user_change_seq', table_name='user')
+    op.drop_column('user', 'change_seq')
+    for table in ('category', 'product'):
+        op.drop_index(f'ix_{table}_change_seq', table_name=table)
+        op.drop_column(table, 'change_seq')
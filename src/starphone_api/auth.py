@@ -5,11 +5,14 @@ import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from starphone_api.cache import TTLCache
 from starphone_api.config import settings
-from starphone_api.db import ActiveSession
+from starphone_api.db import ReadSession, is_replica_session
+from starphone_api.invalidation import cache_invalidations, notify_cache_invalidation
 from starphone_api.models import User
-from starphone_api.security import verify_password
+from starphone_api.security import verify_password_async
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -17,6 +20,49 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_HOURS = 24
 
+# Usuários autenticados, indexados pelo "sub" do token (email)
+current_user_cache: TTLCache[str, User] = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+# Usuários alterados há pouco (neste ou, via NOTIFY, em outro worker): uma
+# leitura deles na réplica pode vir atrasada e não volta para o cache
+recently_changed_users: TTLCache[str, bool] = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.DATABASE_READ_YOUR_WRITES_SECONDS,
+)
+
+# Canal do PostgreSQL em que as alterações de usuário são avisadas a todos os workers
+USER_INVALIDATION_CHANNEL = "starphone_user_changed"
+
+
+def invalidate_cached_user(*emails: str) -> None:
+    """
+    Remove usuários do cache de autenticação deste worker.
+    Deve ser chamada sempre que um usuário for alterado, desativado ou
+    reativado, junto com `notify_user_changed` para os demais workers.
+    """
+    for email in emails:
+        current_user_cache.invalidate(email)
+        recently_changed_users.set(email, True)
+
+
+# O cache de usuários é invalidado em todos os workers pelo canal acima
+cache_invalidations.register(
+    USER_INVALIDATION_CHANNEL,
+    on_notify=invalidate_cached_user,
+    on_reset=current_user_cache.clear,
+)
+
+
+async def notify_user_changed(session: AsyncSession, *emails: str) -> None:
+    """
+    Avisa todos os workers que os usuários mudaram (ver `notify_cache_invalidation`).
+    """
+    await notify_cache_invalidation(session, USER_INVALIDATION_CHANNEL, *emails)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -57,7 +103,7 @@ def decode_token(token: str) -> dict:
 
 
 async def get_current_user(
-    session: ActiveSession,
+    session: ReadSession,
     token: str = Depends(oauth2_scheme),
 ) -> User:
     """
@@ -73,13 +119,22 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = session.exec(select(User).where(User.email == email)).first()
+    user = current_user_cache.get(email) if cache_invalidations.cache_usable else None
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário não encontrado",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        # Uma invalidação durante a consulta impede que o resultado vá para o cache
+        generation = current_user_cache.generation
+        user = (await session.exec(select(User).where(User.email == email))).first()
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Usuário não encontrado",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        # Desanexa da sessão para que a instância possa ser reutilizada
+        # por outras requisições sem disparar I/O
+        session.expunge(user)
+        if not (is_replica_session(session) and recently_changed_users.get(email)):
+            current_user_cache.set(email, user, generation)
     
     if not user.is_active:
         raise HTTPException(
@@ -104,11 +159,11 @@ async def get_current_active_admin(
     return current_user
 
 
-async def authenticate_user(email: str, password: str, session: ActiveSession) -> Optional[User]:
+async def authenticate_user(email: str, password: str, session: ReadSession) -> Optional[User]:
     """
     Autentica um usuário com email e senha.
     """
-    user = session.exec(select(User).where(User.email == email)).first()
+    user = (await session.exec(select(User).where(User.email == email))).first()
     
     if not user:
         return None
@@ -116,7 +171,7 @@ async def authenticate_user(email: str, password: str, session: ActiveSession) -
     if not user.is_active:
         return None
     
-    if not verify_password(password, user.password):
+    if not await verify_password_async(password, user.password):
         return None
     
     return user
@@ -125,12 +180,12 @@ async def authenticate_user(email: str, password: str, session: ActiveSession) -
 async def login_for_access_token(
     email: str,
     password: str,
-    session: ActiveSession,
+    session: ReadSession,
 ) -> dict:
     """
     Realiza login e retorna um token JWT.
     """
-    user = session.exec(select(User).where(User.email == email)).first()
+    user = (await session.exec(select(User).where(User.email == email))).first()
     
     if not user:
         raise HTTPException(
@@ -146,7 +201,7 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not verify_password(password, user.password):
+    if not await verify_password_async(password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email ou senha incorretos",
@@ -0,0 +1,91 @@
+"""
+Mede o custo de CPU da compressão contra os bytes economizados, para
+páginas da listagem de produtos e exportações NDJSON de tamanhos típicos.
+
+Uso: python -m starphone_api.benchmarks.compression [quantidade_de_produtos ...]
+"""
+import json
+import sys
+import time
+
+from starphone_api.benchmarks.serialization import make_products, make_rows, projected_path
+from starphone_api.compression import BrotliCompressor, Compressor, GzipCompressor, brotli
+
+EXPORT_CHUNK_ROWS = 1000
+
+
+def ndjson_chunks(size: int) -> list[bytes]:
+    """
+    Simula o corpo de GET /products/export?format=ndjson em pedaços de
+    1000 linhas, como `iter_export` envia.
+    """
+    lines = [
+        json.dumps(
+            {
+                "id": i,
+                "name": f"Produto {i}",
+                "category_id": 1 + i % 8,
+                "category": f"Categoria {i % 8}",
+                "quantity": i % 50,
+                "cost_value": "1234.5600000000",
+                "profit_value": "321.0000000000",
+            }
+        )
+        + "\n"
+        for i in range(1, size + 1)
+    ]
+    return [
+        "".join(lines[start:start + EXPORT_CHUNK_ROWS]).encode("utf-8")
+        for start in range(0, len(lines), EXPORT_CHUNK_ROWS)
+    ]
+
+
+def compressors() -> dict[str, tuple[type[Compressor], int]]:
+    options = {f"gzip-{level}": (GzipCompressor, level) for level in (1, 6, 9)}
+    if brotli is not None:
+        options.update({f"br-{quality}": (BrotliCompressor, quality) for quality in (1, 4, 6)})
+    return options
+
+
+def compress(chunks: list[bytes], factory, level: int) -> bytes:
+    compressor = factory(level)
+    out = []
+    for chunk in chunks[:-1]:
+        out.append(compressor.compress(chunk) + compressor.flush())
+    out.append(compressor.compress(chunks[-1]) + compressor.finish())
+    return b"".join(out)
+
+
+def measure(label: str, chunks: list[bytes]) -> None:
+    original = sum(len(chunk) for chunk in chunks)
+    for name, (factory, level) in compressors().items():
+        repeat = max(3, 2_000_000 // original)
+        compressed = compress(chunks, factory, level)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            compress(chunks, factory, level)
+        elapsed = (time.perf_counter() - start) / repeat
+        saved = original - len(compressed)
+        print(
+            f"{label:<20} {name:<7} {original:>10} {len(compressed):>10} "
+            f"{original / len(compressed):>6.1f}x {elapsed * 1000:>9.3f} "
+            f"{saved / 1024 / max(elapsed * 1000, 1e-9):>10.1f}"
+        )
+
+
+def main(sizes: list[int]) -> None:
+    print(
+        f"{'payload':<20} {'codec':<7} {'bytes':>10} {'comprimido':>10} "
+        f"{'razão':>7} {'CPU (ms)':>9} {'KiB/ms CPU':>10}"
+    )
+    for size in sizes:
+        rows = make_rows(make_products(size))
+        measure(f"lista {size}", [projected_path(rows)])
+    for size in (10_000, 100_000):
+        measure(f"export ndjson {size}", ndjson_chunks(size))
+    if brotli is None:
+        print("\nbrotli não instalado: apenas gzip medido")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [20, 50, 200])
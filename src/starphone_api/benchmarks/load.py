@@ -0,0 +1,271 @@
+"""
+Benchmark de carga: dispara requisições contra o app FastAPI real (via
+cliente ASGI, sem rede) e mede latência p50/p95/p99 e vazão por cenário.
+
+Os dados vêm de `starphone_api.benchmarks.seed`. Os resultados são salvos
+em JSON (com o commit e o banco usados) para comparar entre commits:
+
+    python -m starphone_api.benchmarks.seed --products 100000 --reset
+    python -m starphone_api.benchmarks.load --output resultados/antes.json
+    python -m starphone_api.benchmarks.load --compare resultados/antes.json
+
+Com SQLite como substituto, o cenário de escrita falha (os UPDATE com CTE
+exigem PostgreSQL) e aparece apenas como erros. No cenário de login cada
+usuário de benchmark entra de um IP próprio, como um terminal, para não
+esgotar o limite por IP do controle de admissão; recusas (429) que ainda
+ocorram aparecem separadas dos erros.
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from sqlalchemy import func, make_url
+from sqlmodel import select
+
+from starphone_api.benchmarks.seed import (
+    BENCH_ADMIN_EMAIL,
+    BENCH_EMAIL_DOMAIN,
+    BENCH_PASSWORD,
+    bench_user_email,
+)
+from starphone_api.config import settings
+
+RequestFactory = Callable[[httpx.AsyncClient, random.Random], Awaitable[httpx.Response]]
+
+DEFAULT_OUTPUT_DIR = Path("benchmarks/results")
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    # Nearest-rank: sempre um valor observado
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    make_request: RequestFactory,
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    rejected = 0
+    remaining = requests
+
+    async def worker(worker_id: int) -> None:
+        nonlocal remaining, errors, rejected
+        rng = random.Random(seed * 1000 + worker_id)
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await make_request(client, rng)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code == 429:
+                rejected += 1
+            elif response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rejected": rejected,
+        "concurrency": concurrency,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+def terminal_client(app, index: int) -> httpx.AsyncClient:
+    """
+    Cliente com endereço de origem próprio (10.x.y.z), como um terminal do PDV.
+    """
+    address = f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}"
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False, client=(address, 50000))
+    return httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+
+def build_scenarios(
+    product_ids: list[int], terminals: list[httpx.AsyncClient]
+) -> dict[str, RequestFactory]:
+    async def login(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        # Cada usuário entra pelo seu terminal
+        user = rng.randint(1, len(terminals))
+        return await terminals[user - 1].post(
+            "/auth/login",
+            data={"username": bench_user_email(user), "password": BENCH_PASSWORD},
+        )
+
+    async def product_list(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.get(
+            "/products/",
+            params={"limit": 50, "sort": rng.choice(["id", "name", "quantity"])},
+        )
+
+    async def product_detail(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.get(f"/products/{rng.choice(product_ids)}/")
+
+    async def stock_write(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.post(
+            f"/products/{rng.choice(product_ids)}/stock/",
+            json={"delta": rng.choice([1, -1])},
+        )
+
+    return {
+        "login": login,
+        "product_list": product_list,
+        "product_detail": product_detail,
+        "stock_write": stock_write,
+    }
+
+
+async def load_context() -> dict:
+    from starphone_api.db import async_session_maker
+    from starphone_api.models import Product, User
+
+    async with async_session_maker() as session:
+        product_ids = (await session.exec(select(Product.id).limit(100_000))).all()
+        product_count = (await session.exec(select(func.count()).select_from(Product))).one()
+        bench_users = User.email.like(f"user%@{BENCH_EMAIL_DOMAIN}")
+        users = (await session.exec(select(func.count()).where(bench_users))).one()
+    return {"product_ids": list(product_ids), "product_count": product_count, "users": users}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from starphone_api.db import async_engine
+    from starphone_api.main import app
+
+    try:
+        context = await load_context()
+        if not context["product_ids"] or not context["users"]:
+            raise SystemExit("Sem dados de benchmark: rode starphone_api.benchmarks.seed antes")
+
+        # Erros 500 contam como falha do cenário em vez de abortar o benchmark
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        terminals = [terminal_client(app, i) for i in range(1, context["users"] + 1)]
+        async with AsyncExitStack() as stack:
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(transport=transport, base_url="http://bench")
+            )
+            for terminal in terminals:
+                await stack.enter_async_context(terminal)
+            token = (
+                await client.post(
+                    "/auth/login",
+                    data={"username": BENCH_ADMIN_EMAIL, "password": BENCH_PASSWORD},
+                )
+            ).json()["access_token"]
+            client.headers["Authorization"] = f"Bearer {token}"
+
+            scenarios = build_scenarios(context["product_ids"], terminals)
+            counts = {
+                "login": args.login_requests,
+                "product_list": args.requests,
+                "product_detail": args.requests,
+                "stock_write": args.requests,
+            }
+            results = {}
+            for name in args.scenarios:
+                results[name] = await run_scenario(
+                    client, scenarios[name], counts[name], args.concurrency, args.seed
+                )
+                print_result(name, results[name])
+    finally:
+        await async_engine.dispose()
+
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "database": make_url(settings.DATABASE_URL).get_backend_name(),
+        "products": context["product_count"],
+        "python": platform.python_version(),
+        "concurrency": args.concurrency,
+        "scenarios": results,
+    }
+
+
+def print_result(name: str, result: dict) -> None:
+    print(
+        f"{name:<15} {result['requests']:>6} req {result['errors']:>5} erros "
+        f"{result.get('rejected', 0):>5} 429 "
+        f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+        f"p99 {result['p99_ms']:>8.2f} ms  {result['throughput_rps']:>8.1f} req/s"
+    )
+
+
+def print_comparison(baseline: dict, current: dict) -> None:
+    print(f"\nComparação com {baseline.get('commit')} ({baseline.get('created_at')}):")
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        deltas = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            if before[key]:
+                deltas.append(f"{key} {(result[key] - before[key]) / before[key] * 100:+.1f}%")
+        print(f"{name:<15} " + "  ".join(deltas))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de carga da API")
+    parser.add_argument("--requests", type=int, default=500, help="requisições por cenário")
+    parser.add_argument("--login-requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=["login", "product_list", "product_detail", "stock_write"],
+        choices=["login", "product_list", "product_detail", "stock_write"],
+    )
+    parser.add_argument("--output", type=Path, default=None, help="arquivo JSON de resultado")
+    parser.add_argument("--compare", type=Path, default=None, help="resultado anterior (JSON)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    output = args.output or DEFAULT_OUTPUT_DIR / (
+        f"{datetime.now(timezone.utc):%Y%m%d-%H%M%S}-{report['commit'] or 'sem-commit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResultado salvo em {output}")
+
+    if args.compare:
+        print_comparison(json.loads(args.compare.read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Gera dados sintéticos (categorias, usuários e produtos) para benchmarks.
+
+Roda sobre o engine assíncrono da API (funciona com o PostgreSQL ou com
+um SQLite via aiosqlite) e insere em lotes com executemany, então 1M de
+produtos cabe em poucos minutos no PostgreSQL. O esquema deve existir
+(alembic upgrade head); com SQLite, use --create-schema para criá-lo a
+partir dos modelos.
+
+Uso:
+    python -m starphone_api.benchmarks.seed --products 100000
+    python -m starphone_api.benchmarks.seed --products 1000 --create-schema --reset
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, or_
+from sqlmodel import Session, SQLModel, select
+
+from starphone_api.models import (
+    CatalogVersion,
+    Category,
+    Product,
+    Sale,
+    SaleItem,
+    User,
+)
+from starphone_api.security import get_password_hash
+
+BATCH_SIZE = 5000
+
+BENCH_EMAIL_DOMAIN = "bench.starphone.local"
+BENCH_ADMIN_EMAIL = f"admin@{BENCH_EMAIL_DOMAIN}"
+BENCH_PASSWORD = "bench123"
+BENCH_CATEGORY_PREFIX = "Categoria "
+
+BRANDS = ("Samsung", "Apple", "Motorola", "Xiaomi", "LG", "Asus", "Nokia", "Realme")
+KINDS = ("Smartphone", "Capa", "Película", "Carregador", "Cabo USB-C", "Fone", "Suporte")
+
+
+def bench_user_email(index: int) -> str:
+    return f"user{index}@{BENCH_EMAIL_DOMAIN}"
+
+
+def _insert_batches(session: Session, model, rows) -> int:
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            session.exec(insert(model), params=batch)
+            total += len(batch)
+            batch.clear()
+    if batch:
+        session.exec(insert(model), params=batch)
+        total += len(batch)
+    return total
+
+
+def reset(session: Session) -> None:
+    """
+    Apaga os dados gerados por `seed`: vendas e produtos dos usuários de
+    benchmark, as categorias geradas que ficarem vazias e esses usuários.
+
+    Recusa (SystemExit) se houver produtos ou vendas de outros usuários: o
+    banco não é de benchmark e nada é apagado.
+    """
+    bench_users = select(User.id).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+    foreign = session.exec(
+        select(Product.id)
+        .where(or_(Product.created_by.is_(None), Product.created_by.not_in(bench_users)))
+        .limit(1)
+    ).first() or session.exec(
+        select(Sale.id)
+        .where(or_(Sale.created_by.is_(None), Sale.created_by.not_in(bench_users)))
+        .limit(1)
+    ).first()
+    if foreign is not None:
+        raise SystemExit(
+            "--reset recusado: o banco tem produtos ou vendas que não foram gerados pelo benchmark"
+        )
+
+    bench_sales = select(Sale.id).where(Sale.created_by.in_(bench_users))
+    session.exec(delete(SaleItem).where(SaleItem.sale_id.in_(bench_sales)))
+    session.exec(delete(Sale).where(Sale.created_by.in_(bench_users)))
+    session.exec(delete(Product).where(Product.created_by.in_(bench_users)))
+    session.exec(
+        delete(Category).where(
+            Category.name.like(f"{BENCH_CATEGORY_PREFIX}%"),
+            ~select(Product.id).where(Product.category_id == Category.id).exists(),
+        )
+    )
+    session.exec(delete(User).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}")))
+
+
+def seed(session: Session, products: int, categories: int, users: int, rng: random.Random) -> dict:
+    now = datetime.now(timezone.utc)
+    # Um único hash para todos os usuários: o custo do Argon2 não entra na carga
+    password = get_password_hash(BENCH_PASSWORD)
+
+    catalog_version = session.get(CatalogVersion, 1)
+    if catalog_version is None:
+        catalog_version = CatalogVersion(id=1, version=1)
+        session.add(catalog_version)
+    # Linhas geradas entram na versão atual (visíveis em /products/changes)
+    seq = catalog_version.version
+
+    bench_users = select(User.id).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+    if not session.exec(bench_users).first():
+        _insert_batches(
+            session,
+            User,
+            (
+                {
+                    "fullname": "Admin Benchmark" if i == 0 else f"Vendedor {i}",
+                    "email": BENCH_ADMIN_EMAIL if i == 0 else bench_user_email(i),
+                    "salary": Decimal("3500.00"),
+                    "hiring_date": now,
+                    "admin": i == 0,
+                    "password": password,
+                    "active": True,
+                }
+                for i in range(users + 1)
+            ),
+        )
+    user_ids = session.exec(bench_users).all()
+
+    start = session.exec(select(func.count()).select_from(Category)).one()
+    _insert_batches(
+        session,
+        Category,
+        ({"name": f"{BENCH_CATEGORY_PREFIX}{start + i}", "change_seq": seq} for i in range(categories)),
+    )
+    category_ids = session.exec(select(Category.id)).all()
+
+    def product_rows():
+        for i in range(products):
+            user_id = rng.choice(user_ids)
+            yield {
+                "name": f"{rng.choice(KINDS)} {rng.choice(BRANDS)} {i}",
+                "category_id": rng.choice(category_ids),
+                "quantity": rng.randint(0, 200),
+                "cost_value": Decimal(rng.randint(500, 500_000)) / 100,
+                "profit_value": Decimal(rng.randint(100, 100_000)) / 100,
+                "created_by": user_id,
+                "updated_by": user_id,
+                "change_seq": seq,
+            }
+
+    inserted = _insert_batches(session, Product, product_rows())
+    session.commit()
+    return {"users": len(user_ids), "categories": len(category_ids), "products": inserted}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from starphone_api.db import async_engine
+
+    categories = args.categories or max(1, args.products // 200)
+    try:
+        async with async_engine.begin() as conn:
+            if args.create_schema:
+                await conn.run_sync(SQLModel.metadata.create_all)
+
+            def generate(sync_conn) -> dict:
+                with Session(bind=sync_conn) as session:
+                    if args.reset:
+                        reset(session)
+                    return seed(
+                        session, args.products, categories, args.users, random.Random(args.seed)
+                    )
+
+            return await conn.run_sync(generate)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos para benchmarks")
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=None, help="padrão: produtos / 200")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42, help="semente do gerador aleatório")
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="apaga os dados de benchmark antes de gerar (recusa bancos com outros dados)",
+    )
+    parser.add_argument("--create-schema", action="store_true", help="cria as tabelas (SQLite)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    totals = asyncio.run(run(args))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{totals['products']} produtos, {totals['categories']} categorias e "
+        f"{totals['users']} usuários de benchmark em {elapsed:.1f}s "
+        f"(login: {BENCH_ADMIN_EMAIL} / {BENCH_PASSWORD})"
+    )
+
+
+if __name__ == "__main__":
+    main()
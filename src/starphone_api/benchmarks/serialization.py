@@ -0,0 +1,129 @@
+"""
+Compara o custo de montar a página de produtos pelos dois caminhos:
+
+- ORM: objetos Product com relacionamentos -> ProductResponse.model_validate
+  -> model_dump(mode="json") -> json.dumps (o que o FastAPI faz com
+  `response_model` quando a rota devolve modelos);
+- projeção: linhas com as colunas da resposta -> dicts -> TypeAdapter
+  pré-compilado -> bytes JSON (caminho atual de GET /products/).
+
+Não usa banco: mede apenas a serialização, que é a parte da requisição
+que cresce com o tamanho da página.
+
+Uso: python -m starphone_api.benchmarks.serialization [tamanho_da_página ...]
+"""
+import json
+import sys
+import time
+from collections import namedtuple
+from decimal import Decimal
+from functools import partial
+from typing import Callable
+
+from starphone_api.models import Category, Product, User
+from starphone_api.routes.product import _product_record
+from starphone_api.serializers.product import (
+    ProductPageResponse,
+    ProductResponse,
+    product_page_json,
+)
+
+ProductRow = namedtuple(
+    "ProductRow",
+    [
+        "id",
+        "name",
+        "quantity",
+        "cost_value",
+        "profit_value",
+        "category_id",
+        "category_name",
+        "created_by_id",
+        "created_by_name",
+        "created_by_email",
+        "updated_by_id",
+        "updated_by_name",
+        "updated_by_email",
+    ],
+)
+
+
+def make_products(count: int) -> list[Product]:
+    category = Category(id=1, name="Smartphones")
+    user = User(id=1, fullname="Admin", email="admin@starphone.com", password="x")
+    return [
+        Product(
+            id=i,
+            name=f"Produto {i}",
+            category_id=category.id,
+            category=category,
+            quantity=i % 50,
+            cost_value=Decimal("1234.5600000000"),
+            profit_value=Decimal("321.0000000000"),
+            created_by=user.id,
+            updated_by=user.id,
+            created_by_user=user,
+            updated_by_user=user,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_rows(products: list[Product]) -> list[ProductRow]:
+    return [
+        ProductRow(
+            product.id,
+            product.name,
+            product.quantity,
+            product.cost_value,
+            product.profit_value,
+            product.category.id,
+            product.category.name,
+            product.created_by_user.id,
+            product.created_by_user.fullname,
+            product.created_by_user.email,
+            product.updated_by_user.id,
+            product.updated_by_user.fullname,
+            product.updated_by_user.email,
+        )
+        for product in products
+    ]
+
+
+def orm_path(products: list[Product]) -> bytes:
+    page = ProductPageResponse(
+        items=[ProductResponse.model_validate(product) for product in products],
+        next_cursor=None,
+    )
+    return json.dumps(page.model_dump(mode="json")).encode("utf-8")
+
+
+def projected_path(rows: list[ProductRow]) -> bytes:
+    return product_page_json.dump_json(
+        {"items": [_product_record(row) for row in rows], "next_cursor": None}
+    )
+
+
+def timeit(func: Callable[[], bytes], repeat: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'página':>8} {'ORM (ms)':>10} {'projeção (ms)':>14} {'ganho':>7}")
+    for size in sizes:
+        products = make_products(size)
+        rows = make_rows(products)
+        assert json.loads(orm_path(products)) == json.loads(projected_path(rows))
+
+        repeat = max(20, 20_000 // size)
+        orm = timeit(partial(orm_path, products), repeat)
+        projected = timeit(partial(projected_path, rows), repeat)
+        print(f"{size:>8} {orm * 1000:>10.3f} {projected * 1000:>14.3f} {orm / projected:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [20, 50, 200])
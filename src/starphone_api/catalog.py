@@ -0,0 +1,123 @@
+import hashlib
+from typing import Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import insert, literal, update
+from sqlalchemy import select as sa_select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from starphone_api.models import CatalogTombstone, CatalogVersion, Category, Product, User
+
+CATALOG_VERSION_ID = 1
+
+# change_seq das linhas gravadas na transação atual, trocado pela nova
+# versão do catálogo em `bump_catalog_version`, logo antes do commit
+PENDING_CHANGE_SEQ = 0
+
+# Tabelas com change_seq que podem ser carimbadas
+Stamped = type[Category] | type[Product] | type[User]
+
+
+async def bump_catalog_version(
+    session: AsyncSession,
+    *stamp: Stamped,
+    tombstones: Sequence[tuple[str, int]] = (),
+) -> int:
+    """
+    Incrementa a versão do catálogo e retorna a nova versão. Deve ser a
+    última escrita antes do commit de toda alteração em produtos,
+    categorias ou nos dados de usuário exibidos nos produtos: a linha da
+    versão fica travada só daí até o commit, então escritas concorrentes
+    não se enfileiram atrás dela e ficam visíveis na ordem das versões.
+
+    As linhas das tabelas em `stamp` gravadas com PENDING_CHANGE_SEQ nesta
+    transação recebem a nova versão como change_seq, e `tombstones`
+    (("product", id), ...) registra exclusões para a sincronização
+    incremental. No PostgreSQL tudo vai em um único comando.
+    """
+    bump = (
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ID)
+        .values(version=CatalogVersion.version + 1)
+        .returning(CatalogVersion.version)
+    )
+
+    if session.get_bind().dialect.name == "postgresql":
+        bumped = bump.cte("bumped")
+        version = sa_select(bumped.c.version).scalar_subquery()
+        stmt = sa_select(bumped.c.version)
+        for model in stamp:
+            stmt = stmt.add_cte(
+                update(model)
+                .where(model.change_seq == PENDING_CHANGE_SEQ)
+                .values(change_seq=version)
+                .returning(model.id)
+                .cte(f"stamped_{model.__tablename__}")
+            )
+        for i, (entity, entity_id) in enumerate(tombstones):
+            stmt = stmt.add_cte(
+                insert(CatalogTombstone)
+                .from_select(
+                    ["entity", "entity_id", "change_seq"],
+                    sa_select(literal(entity), literal(entity_id), bumped.c.version),
+                )
+                .returning(CatalogTombstone.entity_id)
+                .cte(f"tombstone_{i}")
+            )
+        return (await session.exec(stmt)).scalar_one()
+
+    seq = (await session.exec(bump)).scalar_one()
+    for model in stamp:
+        await session.exec(
+            update(model).where(model.change_seq == PENDING_CHANGE_SEQ).values(change_seq=seq)
+        )
+    for entity, entity_id in tombstones:
+        await session.exec(
+            insert(CatalogTombstone).values(entity=entity, entity_id=entity_id, change_seq=seq)
+        )
+    return seq
+
+
+async def get_catalog_version(session: AsyncSession) -> int:
+    version = (
+        await session.exec(
+            select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID)
+        )
+    ).first()
+    return version or 0
+
+
+# ETags fracos: o mesmo conteúdo vai comprimido (gzip/brotli) ou não conforme
+# o cliente, então o 200 e o 304 levam sempre a mesma forma W/"..."
+def catalog_etag(version: int) -> str:
+    return f'W/"catalog-{version}"'
+
+
+def content_etag(content: bytes) -> str:
+    return f'W/"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Compara o cabeçalho If-None-Match com o ETag atual (comparação fraca,
+    como define a RFC 9110 para If-None-Match).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == opaque for candidate in candidates)
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -5,9 +7,57 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_ECHO: bool
     DATABASE_CONNECT_ARGS: dict
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 5
+    DATABASE_POOL_TIMEOUT: float = 10
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 0  # 0 desativa
+    # Réplica de leitura (opcional) para as rotas somente leitura
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DATABASE_REPLICA_RETRY_SECONDS: float = 10
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = 5
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
 
+    # Pool dedicado ao Argon2 (hash/verificação de senha)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Controle de admissão do login (token bucket por conta e por IP)
+    LOGIN_RATE_ACCOUNT_CAPACITY: int = 5
+    LOGIN_RATE_ACCOUNT_PER_MINUTE: float = 5
+    LOGIN_RATE_IP_CAPACITY: int = 20
+    LOGIN_RATE_IP_PER_MINUTE: float = 30
+    LOGIN_RATE_MAX_KEYS: int = 10000
+    LOGIN_RATE_LIMIT_BACKEND: Optional[str] = None  # "modulo:Classe"; padrão em memória
+
+    # Cache do usuário autenticado (get_current_user). No PostgreSQL as
+    # alterações chegam a todos os workers por LISTEN/NOTIFY; o TTL só
+    # limita entradas de usuários que deixaram de ser usados
+    USER_CACHE_TTL_SECONDS: float = 30
+    USER_CACHE_MAX_SIZE: int = 1024
+
+    # Cache de leitura das categorias
+    CATEGORY_CACHE_TTL_SECONDS: float = 300
+    CATEGORY_CACHE_MAX_SIZE: int = 1024
+
+    # Intervalo da compactação das variações do estoque no resumo (PostgreSQL)
+    INVENTORY_COMPACT_SECONDS: float = 10
+
+    # Compressão das respostas (brotli ou gzip, conforme o Accept-Encoding)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Desenvolvimento: avisa quando uma rota passa do orçamento de comandos SQL
+    QUERY_BUDGET_CHECK: bool = False
+    QUERY_BUDGET_DEFAULT: Optional[int] = None  # para rotas sem orçamento declarado
+
+    # Aquecimento do worker na subida (lifespan)
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,18 +1,224 @@
-from typing import Annotated
-from sqlmodel import create_engine, Session, SQLModel
+import logging
+import time
+from threading import Lock
+from typing import Annotated, AsyncIterator
+
+from fastapi import Depends, Request
+from sqlalchemy import event, make_url
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
 from starphone_api.config import settings
-from fastapi import Depends
+from starphone_api.metrics import db_read_sessions, instrument_engine
+from starphone_api.query_budget import track_engine_queries
+from starphone_api.replica import mark_primary_commit, wants_primary
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool padrão do engine assíncrono, medindo quanto tempo cada checkout
+    leva (espera por conexão livre + abertura/pre-ping) e quantos
+    estouraram o `pool_timeout`.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += elapsed
+                self.wait_seconds_max = max(self.wait_seconds_max, elapsed)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
 
+def _async_engine_options(database_url: str) -> dict:
+    """
+    Monta as opções do engine assíncrono a partir de `Settings`.
+    Tamanho do pool e statement_timeout só se aplicam ao PostgreSQL.
+    """
+    url = make_url(database_url)
+    connect_args = dict(settings.DATABASE_CONNECT_ARGS)
+    options = {
+        "echo": settings.DATABASE_ECHO,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    }
+
+    if url.get_backend_name() == "postgresql":
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        )
+        if settings.DATABASE_STATEMENT_TIMEOUT_MS:
+            pg_options = connect_args.get("options", "")
+            connect_args["options"] = (
+                f"{pg_options} -c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT_MS}"
+            ).strip()
+
+    options["connect_args"] = connect_args
+    return options
+
+
+# Engine síncrono: usado pelo Alembic e por scripts de manutenção
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DATABASE_ECHO,
     connect_args=settings.DATABASE_CONNECT_ARGS,
 )
 
+# Engine assíncrono: usado pelas rotas da API (psycopg 3 em modo async)
+async_engine = create_async_engine(
+    settings.DATABASE_URL,
+    **_async_engine_options(settings.DATABASE_URL),
+)
+
+# Réplica de leitura opcional: recebe as rotas somente leitura e a
+# consulta do usuário autenticado (ReadSession)
+replica_engine = (
+    create_async_engine(
+        settings.DATABASE_REPLICA_URL,
+        **_async_engine_options(settings.DATABASE_REPLICA_URL),
+    )
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+
+# Conta comandos e tempo de banco por requisição (/metrics e Server-Timing)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+if replica_engine is not None:
+    instrument_engine(replica_engine.sync_engine)
+    # Commits no primário ativam o read-your-writes (ReadYourWritesMiddleware)
+    event.listen(async_engine.sync_engine, "commit", mark_primary_commit)
+# Alimenta os guardas de orçamento de comandos (query_budget)
+track_engine_queries(engine)
+track_engine_queries(async_engine.sync_engine)
+if replica_engine is not None:
+    track_engine_queries(replica_engine.sync_engine)
 
-def get_session() -> Session:
-    with Session(engine) as session:
+# expire_on_commit=False evita lazy loads (I/O implícito) após o commit
+async_session_maker = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+replica_session_maker = (
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+# Após uma falha da réplica, as leituras ficam no primário até este instante
+_replica_retry_at = 0.0
+
+
+def pool_stats() -> dict:
+    """
+    Retorna o estado atual do pool do engine assíncrono.
+    """
+    pool = async_engine.sync_engine.pool
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        return pool.stats()
+    return {
+        "size": 0,
+        "checked_in": 0,
+        "checked_out": 0,
+        "overflow": 0,
+        "max_overflow": 0,
+        "checkouts": 0,
+        "timeouts": 0,
+        "wait_seconds_total": 0.0,
+        "wait_seconds_max": 0.0,
+    }
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    async with async_session_maker() as session:
+        yield session
+
+
+ActiveSession = Annotated[AsyncSession, Depends(get_session)]
+
+
+async def get_read_session(
+    request: Request,
+    primary: ActiveSession,
+) -> AsyncIterator[AsyncSession]:
+    """
+    Sessão para rotas somente leitura: usa a réplica quando configurada e
+    disponível; senão, a mesma sessão do primário da requisição (que só
+    abre conexão se for usada).
+
+    Volta ao primário se a réplica não responder ao abrir a conexão e só
+    tenta de novo após DATABASE_REPLICA_RETRY_SECONDS. Clientes que
+    acabaram de escrever também leem do primário (read-your-writes).
+    """
+    global _replica_retry_at
+
+    if replica_session_maker is None:
+        yield primary
+        return
+    if wants_primary(request) or time.monotonic() < _replica_retry_at:
+        db_read_sessions.labels("primary").inc()
+        yield primary
+        return
+
+    session = replica_session_maker()
+    try:
+        await session.connection()
+    except (DBAPIError, PoolTimeoutError, OSError):
+        await session.close()
+        logger.warning("Réplica de leitura indisponível, usando o primário", exc_info=True)
+        _replica_retry_at = time.monotonic() + settings.DATABASE_REPLICA_RETRY_SECONDS
+        db_read_sessions.labels("fallback").inc()
+        yield primary
+        return
+
+    db_read_sessions.labels("replica").inc()
+    async with session:
         yield session
 
 
-ActiveSession = Annotated[Session, Depends(get_session)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    """
+    Indica se a sessão lê da réplica (e pode estar atrasada em relação ao primário).
+    """
+    return replica_engine is not None and session.bind is replica_engine
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from starphone_api.db import async_session_maker
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+async def iter_export(stmt: Select, export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Executa a consulta com cursor no servidor e gera o arquivo em pedaços
+    de `EXPORT_BATCH_SIZE` linhas, mantendo a memória constante.
+
+    Abre a própria sessão: as dependências com yield do FastAPI são
+    finalizadas antes de o corpo de um StreamingResponse ser enviado.
+    """
+    async with async_session_maker() as session:
+        result = await session.stream(
+            stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        columns = list(result.keys())
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            async for rows in result.partitions():
+                writer.writerows(rows)
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+            return
+
+        async for rows in result.partitions():
+            chunk = "".join(
+                json.dumps(dict(zip(columns, row, strict=True)), default=_json_default) + "\n"
+                for row in rows
+            )
+            yield chunk.encode("utf-8")
+
+
+def export_response(stmt: Select, export_format: ExportFormat, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        iter_export(stmt, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format}"',
+        },
+    )
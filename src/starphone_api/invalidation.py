@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from typing import Callable
+
+from sqlalchemy import func, make_url
+from sqlalchemy import select as sa_select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from starphone_api.config import settings
+from starphone_api.db import async_engine
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_RETRY_SECONDS = 5
+
+
+class CacheInvalidationListener:
+    """
+    Escuta (LISTEN) os avisos de invalidação enviados por qualquer worker e
+    repassa-os aos caches locais, para que uma escrita valha em todos os
+    workers na hora, e não só depois do TTL. Uma única conexão por worker
+    atende todos os canais registrados.
+
+    Só existe no PostgreSQL. Enquanto a conexão de escuta não estiver
+    ativa os caches não são usados (cada requisição consulta o banco), pois
+    avisos perdidos deixariam dados velhos (ou usuários revogados) em cache.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = async_engine.dialect.name == "postgresql"
+        self.listening = False
+        # canal -> (tratamento de cada aviso, limpeza do cache inteiro)
+        self._channels: dict[str, tuple[Callable[[str], None], Callable[[], None]]] = {}
+
+    def register(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_reset: Callable[[], None],
+    ) -> None:
+        """
+        Associa um canal ao cache local. `on_notify` recebe o payload de cada
+        aviso; `on_reset` limpa o cache a cada (re)conexão.
+        """
+        self._channels[channel] = (on_notify, on_reset)
+
+    @property
+    def cache_usable(self) -> bool:
+        # Sem o canal (SQLite, um único worker) vale só a invalidação local
+        return self.listening or not self.enabled
+
+    async def run(self) -> None:
+        """
+        Mantém a escuta ativa, reconectando após falhas. Rodada como tarefa
+        de fundo pelo lifespan do app.
+        """
+        import psycopg
+
+        url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+        conninfo = url.render_as_string(hide_password=False)
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    conninfo, autocommit=True, **settings.DATABASE_CONNECT_ARGS
+                ) as conn:
+                    for channel in self._channels:
+                        await conn.execute(f"LISTEN {channel}")
+                    # Avisos enviados enquanto estava desconectado se perderam
+                    for _, on_reset in self._channels.values():
+                        on_reset()
+                    self.listening = True
+                    async for notify in conn.notifies():
+                        on_notify, _ = self._channels[notify.channel]
+                        on_notify(notify.payload)
+            except Exception:
+                logger.warning(
+                    "Escuta de invalidação de caches interrompida, caches desativados",
+                    exc_info=True,
+                )
+            finally:
+                self.listening = False
+            await asyncio.sleep(INVALIDATION_RETRY_SECONDS)
+
+
+cache_invalidations = CacheInvalidationListener()
+
+
+async def notify_cache_invalidation(session: AsyncSession, channel: str, *payloads: str) -> None:
+    """
+    Avisa todos os workers (NOTIFY) que os dados mudaram. Chamada antes do
+    commit da alteração: o PostgreSQL só entrega o aviso no commit.
+    """
+    if cache_invalidations.enabled:
+        await session.exec(sa_select(*(func.pg_notify(channel, payload) for payload in payloads)))
@@ -0,0 +1,118 @@
+"""
+Manutenção das tabelas inventory_summary e inventory_delta.
+
+Os triggers da tabela product registram cada variação do estoque em
+inventory_delta; `compact_inventory_deltas` (rodada periodicamente pelo
+lifespan do app) soma essas variações no resumo. `rebuild_inventory_summary`
+recalcula tudo a partir de product para reconciliação:
+
+    python -m starphone_api.inventory
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import delete, func, insert, text
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from starphone_api.config import settings
+from starphone_api.models import InventoryDelta, InventorySummary, Product
+
+logger = logging.getLogger(__name__)
+
+# Compactação e reconstrução se excluem (as leituras do resumo seguem livres);
+# sem isso uma compactação esperando a reconstrução somaria de novo variações
+# que ela já contou
+LOCK_SUMMARY = text("LOCK TABLE inventory_summary IN EXCLUSIVE MODE")
+
+# Move as variações já confirmadas para o resumo em um único comando. As
+# inseridas por transações ainda abertas não são vistas pelo DELETE e ficam
+# para a próxima rodada
+COMPACT_DELTAS = text(
+    """
+    WITH moved AS (
+        DELETE FROM inventory_delta
+        RETURNING category_id, product_count, total_units, total_cost, total_profit
+    )
+    INSERT INTO inventory_summary AS s
+        (category_id, product_count, total_units, total_cost, total_profit)
+    SELECT category_id, sum(product_count), sum(total_units), sum(total_cost), sum(total_profit)
+    FROM moved
+    GROUP BY category_id
+    ORDER BY category_id
+    ON CONFLICT (category_id) DO UPDATE SET
+        product_count = s.product_count + EXCLUDED.product_count,
+        total_units = s.total_units + EXCLUDED.total_units,
+        total_cost = s.total_cost + EXCLUDED.total_cost,
+        total_profit = s.total_profit + EXCLUDED.total_profit
+    """
+)
+
+
+async def compact_inventory_deltas(session: AsyncSession) -> int:
+    """
+    Soma as variações pendentes no resumo e retorna o número de categorias
+    atualizadas. As escritas em product não esperam por ela.
+    """
+    await session.exec(LOCK_SUMMARY)
+    result = await session.exec(COMPACT_DELTAS)
+    await session.commit()
+    return result.rowcount
+
+
+async def run_inventory_compaction() -> None:
+    """
+    Compacta as variações a cada INVENTORY_COMPACT_SECONDS. Rodada como
+    tarefa de fundo pelo lifespan do app (só no PostgreSQL).
+    """
+    from starphone_api.db import async_session_maker
+
+    while True:
+        await asyncio.sleep(settings.INVENTORY_COMPACT_SECONDS)
+        try:
+            async with async_session_maker() as session:
+                await compact_inventory_deltas(session)
+        except Exception:
+            logger.warning("Falha ao compactar as variações do estoque", exc_info=True)
+
+
+def rebuild_inventory_summary(session: Session) -> int:
+    """
+    Recalcula o resumo do estoque em uma única transação e retorna o
+    número de categorias gravadas. A tabela product fica bloqueada para
+    escrita (SHARE) até o commit, para que nenhuma alteração se perca.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        session.exec(text("LOCK TABLE product IN SHARE MODE"))
+        session.exec(LOCK_SUMMARY)
+
+    session.exec(delete(InventoryDelta))
+    session.exec(delete(InventorySummary))
+    totals = select(
+        Product.category_id,
+        func.count(),
+        func.sum(Product.quantity),
+        func.sum(Product.cost_value * Product.quantity),
+        func.sum(Product.profit_value * Product.quantity),
+    ).group_by(Product.category_id)
+    result = session.exec(
+        insert(InventorySummary).from_select(
+            ["category_id", "product_count", "total_units", "total_cost", "total_profit"],
+            totals,
+        )
+    )
+    session.commit()
+    return result.rowcount
+
+
+def main() -> None:
+    from starphone_api.db import engine
+
+    with Session(engine) as session:
+        count = rebuild_inventory_summary(session)
+    print(f"Resumo do estoque reconstruído: {count} categoria(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import importlib
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from starphone_api.config import settings
+from starphone_api.metrics import login_admission as login_admission_counter
+
+
+class TokenBucketBackend:
+    """
+    Armazena os token buckets. A implementação padrão é em memória (por
+    worker); para dividir os limites entre workers, implemente esta
+    interface sobre um armazenamento compartilhado e aponte
+    LOGIN_RATE_LIMIT_BACKEND para a classe ("modulo:Classe").
+    """
+
+    async def consume(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """
+        Tenta consumir um token de `key`. Retorna 0 se consumiu ou, caso o
+        bucket esteja vazio, quantos segundos faltam para o próximo token.
+        """
+        raise NotImplementedError
+
+    async def reset(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryTokenBucketBackend(TokenBucketBackend):
+    """
+    Buckets em memória, limitados a `max_keys` chaves (as menos usadas são
+    descartadas, o que equivale a um bucket cheio). Sem await entre ler e
+    gravar, então não precisa de lock no event loop.
+    """
+
+    def __init__(self, max_keys: int = 10_000, timer: Callable[[], float] = time.monotonic) -> None:
+        self.max_keys = max_keys
+        self._timer = timer
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def consume(self, key: str, capacity: float, refill_per_second: float) -> float:
+        now = self._timer()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    async def reset(self, key: str) -> None:
+        self._buckets.pop(key, None)
+
+
+def load_backend(path: Optional[str]) -> TokenBucketBackend:
+    if not path:
+        return MemoryTokenBucketBackend(max_keys=settings.LOGIN_RATE_MAX_KEYS)
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class LoginAdmission:
+    """
+    Controle de admissão do login: um token bucket por IP e outro por
+    conta. Tentativas acima do limite recebem 429 antes de qualquer
+    consulta ao banco ou cálculo de Argon2.
+    """
+
+    def __init__(
+        self,
+        backend: TokenBucketBackend,
+        account_capacity: float,
+        account_per_minute: float,
+        ip_capacity: float,
+        ip_per_minute: float,
+    ) -> None:
+        self.backend = backend
+        self.account_capacity = account_capacity
+        self.account_rate = account_per_minute / 60
+        self.ip_capacity = ip_capacity
+        self.ip_rate = ip_per_minute / 60
+        self.admitted = 0
+        self.rejected_ip = 0
+        self.rejected_account = 0
+
+    @staticmethod
+    def account_key(email: str) -> str:
+        return f"login:account:{email.strip().lower()}"
+
+    def _reject(self, retry_after: float) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas de login, tente novamente em instantes",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    async def admit(self, email: str, client_ip: Optional[str]) -> None:
+        if client_ip:
+            retry_after = await self.backend.consume(
+                f"login:ip:{client_ip}", self.ip_capacity, self.ip_rate
+            )
+            if retry_after:
+                self.rejected_ip += 1
+                login_admission_counter.labels("rejected_ip").inc()
+                raise self._reject(retry_after)
+
+        retry_after = await self.backend.consume(
+            self.account_key(email), self.account_capacity, self.account_rate
+        )
+        if retry_after:
+            self.rejected_account += 1
+            login_admission_counter.labels("rejected_account").inc()
+            raise self._reject(retry_after)
+
+        self.admitted += 1
+        login_admission_counter.labels("admitted").inc()
+
+    async def succeeded(self, email: str) -> None:
+        # Login correto devolve o bucket da conta: erros de digitação
+        # anteriores não bloqueiam o operador que acabou de entrar
+        await self.backend.reset(self.account_key(email))
+
+    def stats(self) -> dict:
+        return {
+            "admitted": self.admitted,
+            "rejected_ip": self.rejected_ip,
+            "rejected_account": self.rejected_account,
+        }
+
+
+login_admission = LoginAdmission(
+    backend=load_backend(settings.LOGIN_RATE_LIMIT_BACKEND),
+    account_capacity=settings.LOGIN_RATE_ACCOUNT_CAPACITY,
+    account_per_minute=settings.LOGIN_RATE_ACCOUNT_PER_MINUTE,
+    ip_capacity=settings.LOGIN_RATE_IP_CAPACITY,
+    ip_per_minute=settings.LOGIN_RATE_IP_PER_MINUTE,
+)
@@ -1,10 +1,43 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from starphone_api.compression import CompressionMiddleware
+from starphone_api.config import settings
+from starphone_api.db import async_engine, replica_engine
+from starphone_api.invalidation import cache_invalidations
+from starphone_api.inventory import run_inventory_compaction
+from starphone_api.metrics import MetricsMiddleware
+from starphone_api.query_budget import QueryBudgetMiddleware
+from starphone_api.replica import ReadYourWritesMiddleware
 from starphone_api.routes import main_router
+from starphone_api.warmup import readiness, warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # O uvicorn só aceita conexões depois que a subida termina: o primeiro
+    # cliente já encontra o pool aberto, as consultas compiladas e os caches cheios
+    background = []
+    if cache_invalidations.enabled:
+        background.append(asyncio.create_task(cache_invalidations.run()))
+    if async_engine.dialect.name == "postgresql":
+        background.append(asyncio.create_task(run_inventory_compaction()))
+    if settings.WARMUP_ENABLED:
+        await warm_up()
+    else:
+        readiness.ready = True
+    yield
+    for task in background:
+        task.cancel()
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
 
 
-app = FastAPI(title="Starphone PDV API")
+app = FastAPI(title="Starphone PDV API", lifespan=lifespan)
 
 # Configurar CORS para permitir comunicação com Electron
 app.add_middleware(
@@ -15,4 +48,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Listagens e exportações vão para os terminais comprimidas (gzip/brotli)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+# Com réplica de leitura, quem acabou de escrever lê do primário por alguns segundos
+if replica_engine is not None:
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window_seconds=settings.DATABASE_READ_YOUR_WRITES_SECONDS,
+    )
+
+if settings.QUERY_BUDGET_CHECK:
+    app.add_middleware(QueryBudgetMiddleware, default_budget=settings.QUERY_BUDGET_DEFAULT)
+
+# Mais externo: mede a requisição inteira, incluindo a compressão
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(main_router)
@@ -0,0 +1,207 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Com vários workers (uvicorn --workers N) cada processo tem seus próprios
+# contadores: definindo PROMETHEUS_MULTIPROC_DIR (diretório vazio a cada
+# subida, compartilhado pelos workers) as séries são gravadas em arquivos
+# e o /metrics de qualquer worker devolve a soma de todos
+PROMETHEUS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+request_duration = Histogram(
+    "starphone_http_request_duration_seconds",
+    "Duração das requisições HTTP, por rota.",
+    ("method", "route", "status"),
+    buckets=LATENCY_BUCKETS,
+)
+request_db_queries = Histogram(
+    "starphone_http_request_db_queries",
+    "Número de comandos SQL executados por requisição.",
+    ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+request_db_duration = Histogram(
+    "starphone_http_request_db_duration_seconds",
+    "Tempo gasto no banco por requisição.",
+    ("method", "route"),
+    buckets=LATENCY_BUCKETS,
+)
+db_query_duration = Histogram(
+    "starphone_db_query_duration_seconds",
+    "Duração de cada comando SQL.",
+    buckets=LATENCY_BUCKETS,
+)
+password_hash_duration = Histogram(
+    "starphone_password_hash_duration_seconds",
+    "Duração das operações Argon2 (hash e verificação de senha).",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+login_admission = Counter(
+    "starphone_login_admission",
+    "Tentativas de login admitidas ou recusadas (429) antes do Argon2.",
+    ("result",),
+)
+
+db_read_sessions = Counter(
+    "starphone_db_read_sessions",
+    "Sessões de leitura por destino (replica, primary ou fallback após falha da réplica).",
+    ("target",),
+)
+
+
+def render_metrics() -> bytes:
+    """
+    Métricas no formato texto do Prometheus: de todos os workers no modo
+    multiprocesso, senão só deste processo.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+class RequestTimings:
+    """
+    Tempos acumulados de uma requisição. O objeto é compartilhado pelo
+    contexto da requisição, então os hooks do SQLAlchemy (que rodam no
+    greenlet do driver) e o pool de Argon2 somam no mesmo lugar.
+    """
+
+    __slots__ = ("db_queries", "db_seconds", "hash_seconds")
+
+    def __init__(self) -> None:
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.hash_seconds = 0.0
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+def observe_password_hash(operation: str, seconds: float) -> None:
+    password_hash_duration.labels(operation).observe(seconds)
+    timings = current_timings.get()
+    if timings is not None:
+        timings.hash_seconds += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    db_query_duration.observe(elapsed)
+    timings = current_timings.get()
+    if timings is not None:
+        timings.db_queries += 1
+        timings.db_seconds += elapsed
+
+
+def _handle_error(exception_context) -> None:
+    # Comando que falhou não chega ao after_cursor_execute: descarta o início
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Registra os hooks que medem cada comando SQL executado pelo engine.
+    Para o engine assíncrono, passe `async_engine.sync_engine`.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def route_template(scope: Scope) -> Optional[str]:
+    """
+    Template completo da rota atendida (/products/{product_id}/), usado
+    como label para não explodir a cardinalidade com um label por id.
+    O template da rota é relativo ao ponto de montagem: os prefixos de
+    apps montados (e o root_path do servidor) vêm de `root_path`.
+    """
+    route = scope.get("route")
+    if route is None:
+        return None
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return None
+    return scope.get("root_path", "").rstrip("/") + template
+
+
+def _route_label(scope: Scope) -> str:
+    return route_template(scope) or "unmatched"
+
+
+def _server_timing(total: float, timings: RequestTimings) -> str:
+    return ", ".join(
+        [
+            f"app;dur={total * 1000:.1f}",
+            f'db;dur={timings.db_seconds * 1000:.1f};desc="{timings.db_queries} queries"',
+            f"argon2;dur={timings.hash_seconds * 1000:.1f}",
+        ]
+    )
+
+
+class MetricsMiddleware:
+    """
+    Mede cada requisição HTTP: latência por rota, comandos SQL e tempo de
+    banco por requisição e tempo de Argon2. Os totais vão para os
+    histogramas de /metrics e para o cabeçalho Server-Timing (medidos até o
+    envio dos cabeçalhos; em respostas em streaming não incluem o corpo).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", _server_timing(time.perf_counter() - start, timings))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            elapsed = time.perf_counter() - start
+            method = scope["method"]
+            route = _route_label(scope)
+            request_duration.labels(method, route, str(status_code)).observe(elapsed)
+            request_db_queries.labels(method, route).observe(timings.db_queries)
+            request_db_duration.labels(method, route).observe(timings.db_seconds)
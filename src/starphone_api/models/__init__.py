@@ -1,7 +1,21 @@
 from sqlmodel import SQLModel
 
+from .catalog import CatalogTombstone, CatalogVersion
 from .category import Category
+from .inventory import InventoryDelta, InventorySummary
 from .product import Product
+from .sale import Sale, SaleItem
 from .user import User
 
-__all__ = ["SQLModel", "User", "Category", "Product"]
+__all__ = [
+    "SQLModel",
+    "User",
+    "Category",
+    "Product",
+    "CatalogVersion",
+    "CatalogTombstone",
+    "Sale",
+    "SaleItem",
+    "InventorySummary",
+    "InventoryDelta",
+]
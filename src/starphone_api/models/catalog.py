@@ -0,0 +1,27 @@
+from sqlmodel import Field, SQLModel
+
+
+class CatalogVersion(SQLModel, table=True):
+    """
+    Linha única (id=1) incrementada na mesma transação de toda escrita que
+    altera o catálogo. Usada para gerar os ETags das leituras e como
+    sequência de alterações (`change_seq`) da sincronização incremental.
+    """
+
+    __tablename__ = "catalog_version"
+
+    id: int = Field(primary_key=True)
+    version: int = Field(default=1, nullable=False)
+
+
+class CatalogTombstone(SQLModel, table=True):
+    """
+    Registro de exclusão de um produto ou categoria, para que a
+    sincronização incremental (/products/changes) informe as remoções.
+    """
+
+    __tablename__ = "catalog_tombstone"
+
+    entity: str = Field(primary_key=True)
+    entity_id: int = Field(primary_key=True)
+    change_seq: int = Field(nullable=False, index=True)
@@ -8,6 +8,8 @@ if TYPE_CHECKING:
 class Category(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True, nullable=False)
+    # Versão do catálogo da última escrita na linha (sincronização incremental)
+    change_seq: int = Field(default=0, nullable=False, index=True)
 
     # Relacionamento reverso com Product
     products: list["Product"] = Relationship(back_populates="category")
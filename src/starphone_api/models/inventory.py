@@ -0,0 +1,43 @@
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import BigInteger, Integer
+from sqlmodel import Field, SQLModel
+
+
+class InventorySummary(SQLModel, table=True):
+    """
+    Valor do estoque por categoria até a última compactação. Somado às
+    linhas de `InventoryDelta` dá o valor atual (ver migração e
+    `starphone_api.inventory`).
+    """
+
+    __tablename__ = "inventory_summary"
+
+    category_id: int = Field(foreign_key="category.id", primary_key=True, ondelete="CASCADE")
+    product_count: int = Field(default=0, nullable=False)
+    total_units: int = Field(default=0, nullable=False)
+    total_cost: Decimal = Field(default=Decimal("0"), nullable=False)
+    total_profit: Decimal = Field(default=Decimal("0"), nullable=False)
+
+
+class InventoryDelta(SQLModel, table=True):
+    """
+    Variações do estoque por categoria ainda não compactadas no resumo.
+    Os triggers da tabela product só inserem aqui (sem travar linhas de
+    resumo compartilhadas por escritas concorrentes).
+    """
+
+    __tablename__ = "inventory_delta"
+
+    # BIGINT: uma linha por comando de escrita em product
+    id: Optional[int] = Field(
+        default=None,
+        primary_key=True,
+        sa_type=BigInteger().with_variant(Integer, "sqlite"),
+    )
+    category_id: int = Field(foreign_key="category.id", ondelete="CASCADE")
+    product_count: int = Field(nullable=False)
+    total_units: int = Field(nullable=False)
+    total_cost: Decimal = Field(nullable=False)
+    total_profit: Decimal = Field(nullable=False)
@@ -1,5 +1,6 @@
 from decimal import Decimal
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from starphone_api.models.category import Category
@@ -7,14 +8,36 @@ from starphone_api.models.user import User
 
 
 class Product(SQLModel, table=True):
+    # Índices usados pela paginação por cursor e pelos filtros de listagem
+    __table_args__ = (
+        Index("ix_product_name_id", "name", "id"),
+        Index("ix_product_quantity_id", "quantity", "id"),
+        # Também atende a foreign key category_id
+        Index("ix_product_category_id_id", "category_id", "id"),
+        Index(
+            "ix_product_name_pattern",
+            "name",
+            postgresql_ops={"name": "varchar_pattern_ops"},
+        ),
+        # Busca por parte do nome (pg_trgm)
+        Index(
+            "ix_product_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(nullable=False)
     category_id: int = Field(foreign_key="category.id", nullable=False)
     quantity: int = Field(default=0, nullable=False)
     cost_value: Decimal = Field(nullable=False)
     profit_value: Decimal = Field(nullable=False)
-    created_by: Optional[int] = Field(foreign_key="user.id", nullable=True, default=None)
-    updated_by: Optional[int] = Field(foreign_key="user.id", nullable=True, default=None)
+    created_by: Optional[int] = Field(foreign_key="user.id", nullable=True, default=None, index=True)
+    updated_by: Optional[int] = Field(foreign_key="user.id", nullable=True, default=None, index=True)
+    # Versão do catálogo da última escrita na linha (sincronização incremental)
+    change_seq: int = Field(default=0, nullable=False, index=True)
 
     # Relacionamento com Category
     category: Optional[Category] = Relationship(back_populates="products")
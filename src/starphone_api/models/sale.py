@@ -0,0 +1,27 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from sqlmodel import Field, Relationship, SQLModel
+
+
+class Sale(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(nullable=False)
+    created_by: Optional[int] = Field(foreign_key="user.id", nullable=True, default=None, index=True)
+    total: Decimal = Field(nullable=False)
+
+    # Itens da venda
+    items: list["SaleItem"] = Relationship(back_populates="sale")
+
+
+class SaleItem(SQLModel, table=True):
+    __tablename__ = "sale_item"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    sale_id: int = Field(foreign_key="sale.id", nullable=False, index=True)
+    product_id: int = Field(foreign_key="product.id", nullable=False, index=True)
+    quantity: int = Field(nullable=False)
+    unit_cost: Decimal = Field(nullable=False)
+    unit_price: Decimal = Field(nullable=False)
+
+    sale: Optional[Sale] = Relationship(back_populates="items")
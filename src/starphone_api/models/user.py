@@ -14,6 +14,9 @@ class User(SQLModel, table=True):
     admin: bool = Field(default=False, nullable=False)
     password: str = Field(nullable=False)
     active: bool = Field(default=True, nullable=False)
+    # Versão do catálogo da última alteração de nome/email (exibidos nos
+    # produtos); nulo enquanto não houver nenhuma
+    change_seq: Optional[int] = Field(default=None, nullable=True, index=True)
 
     @property
     def is_admin(self) -> bool:
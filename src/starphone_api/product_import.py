@@ -0,0 +1,263 @@
+import codecs
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator, Literal, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert, or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from starphone_api.catalog import PENDING_CHANGE_SEQ, bump_catalog_version
+from starphone_api.models import Category, Product
+from starphone_api.serializers.product import (
+    ProductImportError,
+    ProductImportResponse,
+    ProductImportRow,
+)
+
+ImportFormat = Literal["csv", "ndjson"]
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Converte o corpo da requisição (em pedaços) em linhas de texto,
+    sem carregar o arquivo inteiro em memória.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+def _ends_inside_quotes(line: str, in_quotes: bool) -> bool:
+    """
+    Diz se o registro CSV continua na próxima linha, ou seja, se `line`
+    termina dentro de um campo entre aspas. Segue as regras do módulo csv:
+    aspas só abrem um campo no seu início e `""` é uma aspa escapada.
+    """
+    if not in_quotes and '"' not in line:
+        return False
+    at_field_start = not in_quotes
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if in_quotes:
+            if char == '"':
+                if line.startswith('"', i + 1):
+                    i += 2
+                    continue
+                in_quotes = False
+        elif char == '"' and at_field_start:
+            in_quotes = True
+        at_field_start = not in_quotes and char == ","
+        i += 1
+    return in_quotes
+
+
+async def _iter_csv_rows(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[tuple[int, Optional[list[str]], Optional[str]]]:
+    """
+    Gera `(linha inicial, valores, erro)` por registro. As linhas de um
+    registro só vão para o csv.reader (único para o arquivo todo) quando ele
+    está completo, então cada linha é lida uma vez só.
+    """
+    feed: deque[str] = deque()
+    reader = csv.reader(iter(feed.popleft, None))
+    line_number = start = 0
+    in_quotes = False
+    async for line in lines:
+        line_number += 1
+        if not feed:
+            start = line_number
+        feed.append(line + "\n")
+        in_quotes = _ends_inside_quotes(line, in_quotes)
+        if in_quotes:
+            continue
+        try:
+            values = next(reader)
+        except csv.Error as exc:
+            feed.clear()
+            yield start, None, f"CSV inválido: {exc}"
+            continue
+        yield start, values, None
+    if feed:
+        yield start, None, "Campo entre aspas sem fechamento"
+
+
+async def iter_records(
+    lines: AsyncIterator[str],
+    file_format: ImportFormat,
+) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Gera `(linha, registro, erro)` para cada registro não vazio do arquivo.
+    No CSV a primeira linha é o cabeçalho, campos vazios são ignorados e
+    campos entre aspas podem ter quebras de linha (o número da linha é o
+    de início do registro).
+    """
+    if file_format == "csv":
+        header: Optional[list[str]] = None
+        async for line_number, values, error in _iter_csv_rows(lines):
+            if error is not None:
+                yield line_number, None, error
+                continue
+            if not values or (len(values) == 1 and not values[0].strip()):
+                continue
+            if header is None:
+                header = [value.strip() for value in values]
+                continue
+            if len(values) != len(header):
+                yield line_number, None, f"Esperadas {len(header)} colunas, encontradas {len(values)}"
+                continue
+            record = {key: value for key, value in zip(header, values, strict=True) if value != ""}
+            yield line_number, record, None
+        return
+
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None, "JSON inválido"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Cada linha deve ser um objeto JSON"
+            continue
+        yield line_number, record, None
+
+
+class ProductImporter:
+    """
+    Importa produtos em lotes dentro de uma única transação.
+
+    As linhas são validadas com as mesmas regras de `ProductRequest`, os
+    nomes de categoria são resolvidos com uma consulta por lote e cada
+    lote é inserido com um único executemany.
+    """
+
+    def __init__(self, session: AsyncSession, user_id: int) -> None:
+        self.session = session
+        self.user_id = user_id
+        self.inserted = 0
+        self.failed = 0
+        self.errors: list[ProductImportError] = []
+        self._category_ids: set[int] = set()
+        self._category_by_name: dict[str, int] = {}
+        self._batch: list[tuple[int, ProductImportRow]] = []
+
+    def add_error(self, line: int, errors: list[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ProductImportError(line=line, errors=errors))
+
+    async def add(self, line: int, record: dict) -> None:
+        try:
+            row = ProductImportRow.model_validate(record)
+        except ValidationError as exc:
+            self.add_error(
+                line,
+                [f"{'.'.join(map(str, err['loc'])) or 'linha'}: {err['msg']}" for err in exc.errors()],
+            )
+            return
+
+        self._batch.append((line, row))
+        if len(self._batch) >= BATCH_SIZE:
+            await self.flush()
+
+    async def _resolve_categories(self) -> None:
+        names = {
+            row.category
+            for _, row in self._batch
+            if row.category_id is None and row.category not in self._category_by_name
+        }
+        ids = {
+            row.category_id
+            for _, row in self._batch
+            if row.category_id is not None and row.category_id not in self._category_ids
+        }
+        if not names and not ids:
+            return
+
+        stmt = select(Category.id, Category.name).where(
+            or_(Category.name.in_(names), Category.id.in_(ids))
+        )
+        for category_id, category_name in (await self.session.exec(stmt)).all():
+            self._category_ids.add(category_id)
+            self._category_by_name[category_name] = category_id
+
+    async def flush(self) -> None:
+        if not self._batch:
+            return
+
+        await self._resolve_categories()
+
+        values = []
+        for line, row in self._batch:
+            if row.category_id is not None:
+                category_id = row.category_id if row.category_id in self._category_ids else None
+            else:
+                category_id = self._category_by_name.get(row.category)
+            if category_id is None:
+                self.add_error(line, ["category: Categoria não encontrada"])
+                continue
+            values.append(
+                {
+                    "name": row.name,
+                    "category_id": category_id,
+                    "quantity": row.quantity,
+                    "cost_value": row.cost_value,
+                    "profit_value": row.profit_value,
+                    "created_by": self.user_id,
+                    "updated_by": self.user_id,
+                    "change_seq": PENDING_CHANGE_SEQ,
+                }
+            )
+        self._batch.clear()
+
+        if values:
+            await self.session.exec(insert(Product), params=values)
+            self.inserted += len(values)
+
+    async def run(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_format: ImportFormat,
+        all_or_nothing: bool = False,
+    ) -> ProductImportResponse:
+        async for line, record, error in iter_records(iter_lines(chunks), file_format):
+            if error is not None:
+                self.add_error(line, [error])
+            else:
+                await self.add(line, record)
+        await self.flush()
+
+        if all_or_nothing and self.failed:
+            await self.session.rollback()
+            self.inserted = 0
+        else:
+            if self.inserted:
+                # A versão só é travada no fim, para não bloquear as outras
+                # escritas do catálogo durante o upload
+                await bump_catalog_version(self.session, Product)
+            await self.session.commit()
+
+        return ProductImportResponse(
+            inserted=self.inserted,
+            failed=self.failed,
+            errors=sorted(self.errors, key=lambda error: error.line),
+            errors_truncated=self.failed > len(self.errors),
+        )
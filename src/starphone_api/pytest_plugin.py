@@ -0,0 +1,33 @@
+"""
+Fixtures de pytest para o guarda de orçamento de comandos SQL.
+
+Ative nos testes com `pytest_plugins = ["starphone_api.pytest_plugin"]`
+e rode com QUERY_BUDGET_CHECK=true para que o middleware confira os
+orçamentos declarados nas rotas.
+"""
+import pytest
+
+from starphone_api.query_budget import assert_query_budget, violations
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Retorna `assert_query_budget` para limitar um trecho do teste:
+
+        with query_budget(3):
+            await client.get("/products/")
+    """
+    return assert_query_budget
+
+
+@pytest.fixture
+def route_query_budgets():
+    """
+    Falha o teste se alguma requisição feita durante ele passou do
+    orçamento declarado com `@query_budget` na rota.
+    """
+    violations.clear()
+    yield violations
+    if violations:
+        pytest.fail("\n\n".join(str(violation) for violation in violations), pytrace=False)
@@ -0,0 +1,131 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional, TypeVar
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from starphone_api.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+# Violações registradas pelo QueryBudgetMiddleware (lidas pela fixture de testes)
+violations: list["QueryBudgetExceeded"] = []
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, budget: int, statements: list[str], route: Optional[str] = None) -> None:
+        self.budget = budget
+        self.statements = statements
+        self.route = route
+        where = f" em {route}" if route else ""
+        listing = "\n".join(f"  {i}. {statement}" for i, statement in enumerate(statements, 1))
+        super().__init__(
+            f"{len(statements)} comandos SQL{where}, orçamento de {budget}:\n{listing}"
+        )
+
+
+class QueryLog:
+    """
+    Comandos SQL executados enquanto o log está ativo no contexto atual.
+    """
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+
+_active_logs: ContextVar[tuple[QueryLog, ...]] = ContextVar("active_query_logs", default=())
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    for log in _active_logs.get():
+        log.statements.append(statement)
+
+
+def track_engine_queries(engine: Engine) -> None:
+    """
+    Registra o hook que alimenta os `QueryLog` ativos. Sem log ativo o
+    custo por comando é uma leitura de ContextVar.
+    """
+    event.listen(engine, "after_cursor_execute", _record_statement)
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryLog]:
+    log = QueryLog()
+    token = _active_logs.set(_active_logs.get() + (log,))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+
+
+@contextmanager
+def assert_query_budget(budget: int) -> Iterator[QueryLog]:
+    """
+    Falha com `QueryBudgetExceeded` se o bloco executar mais de `budget`
+    comandos SQL. Útil em testes e scripts:
+
+        with assert_query_budget(3):
+            await client.get("/products/")
+    """
+    with record_queries() as log:
+        yield log
+    if len(log) > budget:
+        raise QueryBudgetExceeded(budget, log.statements)
+
+
+def query_budget(budget: int) -> Callable[[F], F]:
+    """
+    Declara quantos comandos SQL a rota pode executar por requisição.
+    Usado abaixo do decorator da rota:
+
+        @router.get("/{product_id}/")
+        @query_budget(5)
+        async def get_product(...): ...
+    """
+
+    def decorator(endpoint: F) -> F:
+        endpoint.query_budget = budget
+        return endpoint
+
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """
+    Modo de desenvolvimento: conta os comandos SQL de cada requisição e,
+    quando a rota passa do orçamento declarado com `query_budget` (ou de
+    `default_budget`), registra um aviso com todos os comandos executados.
+    """
+
+    def __init__(self, app: ASGIApp, default_budget: Optional[int] = None) -> None:
+        self.app = app
+        self.default_budget = default_budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with record_queries() as log:
+            await self.app(scope, receive, send)
+
+        route = scope.get("route")
+        budget = getattr(getattr(route, "endpoint", None), "query_budget", self.default_budget)
+        if budget is None or len(log) <= budget:
+            return
+
+        violation = QueryBudgetExceeded(
+            budget,
+            log.statements,
+            route=f"{scope['method']} {route_template(scope) or scope['path']}",
+        )
+        violations.append(violation)
+        logger.warning("%s", violation)
@@ -0,0 +1,84 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Depois de uma escrita, o cliente lê do primário até este instante
+# (epoch em segundos): vale entre workers, pois todos usam o mesmo relógio
+READ_YOUR_WRITES_COOKIE = "starphone_primary_until"
+# Força a leitura no primário em uma requisição específica
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+
+
+class WriteMarker:
+    __slots__ = ("committed",)
+
+    def __init__(self) -> None:
+        self.committed = False
+
+
+_current_write_marker: ContextVar[Optional[WriteMarker]] = ContextVar(
+    "current_write_marker", default=None
+)
+
+
+def mark_primary_commit(conn) -> None:
+    """
+    Hook do evento "commit" do engine primário: registra que a requisição
+    atual gravou algo.
+    """
+    marker = _current_write_marker.get()
+    if marker is not None:
+        marker.committed = True
+
+
+def wants_primary(connection: HTTPConnection) -> bool:
+    """
+    Indica se a requisição deve ler do primário: pediu explicitamente
+    (X-Read-Consistency: primary) ou fez uma escrita há pouco tempo.
+    """
+    if connection.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary":
+        return True
+    try:
+        return float(connection.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marca o cliente cuja requisição fez commit no primário com um cookie
+    curto; enquanto ele valer, as leituras desse cliente vão para o
+    primário e não enxergam o atraso da réplica. Requisições sem escrita
+    (inclusive o login) não recebem o cookie.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        marker = WriteMarker()
+        token = _current_write_marker.set(marker)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and marker.committed:
+                until = time.time() + self.window_seconds
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={until:.3f}; Max-Age={int(self.window_seconds) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _current_write_marker.reset(token)
@@ -1,7 +1,12 @@
 from fastapi import APIRouter
 from starphone_api.routes.auth import router as auth_router
 from starphone_api.routes.category import router as category_router
+from starphone_api.routes.health import router as health_router
+from starphone_api.routes.inventory import router as inventory_router
+from starphone_api.routes.metrics import router as metrics_router
 from starphone_api.routes.product import router as product_router
+from starphone_api.routes.sale import router as sale_router
+from starphone_api.routes.system import router as system_router
 from starphone_api.routes.user import router as user_router
 
 main_router = APIRouter()
@@ -10,3 +15,8 @@ main_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 main_router.include_router(user_router, prefix="/users", tags=["users"])
 main_router.include_router(product_router, prefix="/products", tags=["products"])
 main_router.include_router(category_router, prefix="/categories", tags=["categories"])
+main_router.include_router(inventory_router, prefix="/inventory", tags=["inventory"])
+main_router.include_router(sale_router, prefix="/sales", tags=["sales"])
+main_router.include_router(system_router, prefix="/system", tags=["system"])
+main_router.include_router(health_router, prefix="/health", tags=["health"])
+main_router.include_router(metrics_router, tags=["metrics"])
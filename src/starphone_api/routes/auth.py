@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.security import OAuth2PasswordRequestForm
 
 from starphone_api.auth import get_current_user, login_for_access_token
-from starphone_api.db import ActiveSession
+from starphone_api.db import ReadSession
+from starphone_api.login_admission import login_admission
 from starphone_api.models import User
 from starphone_api.serializers.auth import TokenResponse
 from starphone_api.serializers.user import UserResponse
@@ -12,7 +13,8 @@ router = APIRouter()
 
 @router.post("/login", response_model=TokenResponse)
 async def login(
-    session: ActiveSession,
+    request: Request,
+    session: ReadSession,
     form_data: OAuth2PasswordRequestForm = Depends(),
 ):
     """
@@ -27,14 +29,21 @@ async def login(
         Token JWT e tipo de token
     
     Raises:
-        HTTPException: Se as credenciais forem inválidas
+        HTTPException: Se as credenciais forem inválidas ou (429) se a conta
+            ou o IP passaram do limite de tentativas
     """
+    # Recusa com 429 antes de consultar o banco ou calcular o Argon2
+    client_ip = request.client.host if request.client else None
+    await login_admission.admit(form_data.username, client_ip)
+
     # OAuth2PasswordRequestForm usa "username" para o email
-    return await login_for_access_token(
+    token = await login_for_access_token(
         email=form_data.username,
         password=form_data.password,
         session=session,
     )
+    await login_admission.succeeded(form_data.username)
+    return token
 
 
 @router.get("/me", response_model=UserResponse)
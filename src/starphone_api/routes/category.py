@@ -1,79 +1,236 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import select
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from pydantic import TypeAdapter
+from sqlalchemy import update
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from starphone_api.auth import get_current_user
-from starphone_api.db import ActiveSession
-from starphone_api.models import Category
-from starphone_api.serializers.product import CategoryRequest, CategoryResponse
+from starphone_api.cache import TTLCache
+from starphone_api.catalog import (
+    PENDING_CHANGE_SEQ,
+    bump_catalog_version,
+    content_etag,
+    etag_matches,
+    not_modified,
+    set_etag,
+)
+from starphone_api.config import settings
+from starphone_api.db import ActiveSession, ReadSession, is_replica_session
+from starphone_api.invalidation import cache_invalidations, notify_cache_invalidation
+from starphone_api.models import Category, Product
+from starphone_api.query_budget import query_budget
+from starphone_api.serializers.product import (
+    CategoryRequest,
+    CategoryResponse,
+    CategoryStatsResponse,
+)
 
 router = APIRouter(dependencies=[Depends(get_current_user)])
 
+# Respostas já serializadas (JSON), indexadas por "all" ou pelo id
+category_cache: TTLCache[str | int, bytes] = TTLCache(
+    maxsize=settings.CATEGORY_CACHE_MAX_SIZE,
+    ttl=settings.CATEGORY_CACHE_TTL_SECONDS,
+)
+CATEGORY_LIST_KEY = "all"
+
+# Marca uma escrita recente em categorias (neste ou, via NOTIFY, em outro
+# worker): uma leitura na réplica pode vir atrasada e não volta para o cache
+recently_changed_categories: TTLCache[str, bool] = TTLCache(
+    maxsize=1,
+    ttl=settings.DATABASE_READ_YOUR_WRITES_SECONDS,
+)
+
+# Canal do PostgreSQL em que as escritas em categorias são avisadas a todos os workers
+CATEGORY_INVALIDATION_CHANNEL = "starphone_category_changed"
+
+category_list_adapter = TypeAdapter(list[CategoryResponse])
+
+
+def invalidate_category_cache() -> None:
+    """
+    Descarta as categorias em cache deste worker. Chamada por toda escrita
+    em categorias, junto com `notify_categories_changed` para os demais.
+    """
+    category_cache.clear()
+    recently_changed_categories.set(CATEGORY_LIST_KEY, True)
+
+
+def _cacheable_read(session: AsyncSession) -> bool:
+    return not (is_replica_session(session) and recently_changed_categories.get(CATEGORY_LIST_KEY))
+
+
+cache_invalidations.register(
+    CATEGORY_INVALIDATION_CHANNEL,
+    on_notify=lambda payload: invalidate_category_cache(),
+    on_reset=invalidate_category_cache,
+)
+
+
+async def notify_categories_changed(session: AsyncSession) -> None:
+    """
+    Avisa todos os workers que as categorias mudaram (ver `notify_cache_invalidation`).
+    """
+    await notify_cache_invalidation(session, CATEGORY_INVALIDATION_CHANNEL, "")
+
+
+async def load_category_list(session: AsyncSession) -> bytes:
+    """
+    Consulta todas as categorias e guarda o JSON da listagem no cache.
+    """
+    # Uma escrita durante a consulta impede que o resultado vá para o cache
+    generation = category_cache.generation
+    categories = (await session.exec(select(Category))).all()
+    content = category_list_adapter.dump_json(
+        [CategoryResponse.model_validate(category) for category in categories]
+    )
+    if _cacheable_read(session):
+        category_cache.set(CATEGORY_LIST_KEY, content, generation)
+    return content
+
+
+def _cached_json_response(content: bytes, if_none_match: Optional[str]) -> Response:
+    # ETag derivado do próprio JSON em cache: sem consulta ao banco
+    etag = content_etag(content)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response = Response(content=content, media_type="application/json")
+    set_etag(response, etag)
+    return response
+
 
 @router.post("/", response_model=CategoryResponse)
 async def create_category(*, session: ActiveSession, category: CategoryRequest):
     # Verificar se já existe uma categoria com o mesmo nome
-    existing = session.exec(select(Category).where(Category.name == category.name)).first()
+    existing = (await session.exec(select(Category).where(Category.name == category.name))).first()
     if existing:
         raise HTTPException(status_code=400, detail="Categoria com este nome já existe")
     
-    db_category = Category(name=category.name)
+    db_category = Category(name=category.name, change_seq=PENDING_CHANGE_SEQ)
     session.add(db_category)
-    session.commit()
-    session.refresh(db_category)
+    await notify_categories_changed(session)
+    await bump_catalog_version(session, Category)
+    await session.commit()
+    await session.refresh(db_category)
+    invalidate_category_cache()
     return CategoryResponse.model_validate(db_category)
 
 
 @router.get("/", response_model=list[CategoryResponse])
-async def get_categories(*, session: ActiveSession):
-    categories = session.exec(select(Category)).all()
-    return [CategoryResponse.model_validate(category) for category in categories]
+@query_budget(2)
+async def get_categories(
+    *,
+    session: ReadSession,
+    if_none_match: Optional[str] = Header(default=None),
+):
+    content = category_cache.get(CATEGORY_LIST_KEY) if cache_invalidations.cache_usable else None
+    if content is None:
+        content = await load_category_list(session)
+    return _cached_json_response(content, if_none_match)
+
+
+@router.get("/stats", response_model=list[CategoryStatsResponse])
+@query_budget(2)
+async def get_category_stats(*, session: ReadSession):
+    """
+    Quantidade de produtos, unidades em estoque e valor de custo do estoque
+    por categoria, calculados em um único GROUP BY.
+    """
+    stmt = (
+        select(
+            Category.id,
+            Category.name,
+            func.count(Product.id).label("product_count"),
+            func.coalesce(func.sum(Product.quantity), 0).label("total_units"),
+            func.coalesce(func.sum(Product.cost_value * Product.quantity), 0).label("stock_value"),
+        )
+        .outerjoin(Product, Product.category_id == Category.id)
+        .group_by(Category.id, Category.name)
+        .order_by(Category.name)
+    )
+    rows = (await session.exec(stmt)).all()
+    return [CategoryStatsResponse.model_validate(row._mapping) for row in rows]
 
 
 @router.get("/{category_id}/", response_model=CategoryResponse)
-async def get_category(*, session: ActiveSession, category_id: int):
-    category = session.exec(select(Category).where(Category.id == category_id)).first()
-    if not category:
-        raise HTTPException(status_code=404, detail="Categoria não encontrada")
-    return CategoryResponse.model_validate(category)
+@query_budget(2)
+async def get_category(
+    *,
+    session: ReadSession,
+    category_id: int,
+    if_none_match: Optional[str] = Header(default=None),
+):
+    content = category_cache.get(category_id) if cache_invalidations.cache_usable else None
+    if content is None:
+        generation = category_cache.generation
+        category = (await session.exec(select(Category).where(Category.id == category_id))).first()
+        if not category:
+            raise HTTPException(status_code=404, detail="Categoria não encontrada")
+        content = CategoryResponse.model_validate(category).model_dump_json().encode("utf-8")
+        if _cacheable_read(session):
+            category_cache.set(category_id, content, generation)
+    return _cached_json_response(content, if_none_match)
 
 
 @router.put("/{category_id}/", response_model=CategoryResponse)
 async def update_category(*, session: ActiveSession, category_id: int, category: CategoryRequest):
-    db_category = session.exec(select(Category).where(Category.id == category_id)).first()
+    db_category = (await session.exec(select(Category).where(Category.id == category_id))).first()
     if not db_category:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
     
     # Verificar se já existe outra categoria com o mesmo nome
-    existing = session.exec(
-        select(Category).where(Category.name == category.name, Category.id != category_id)
+    existing = (
+        await session.exec(
+            select(Category).where(Category.name == category.name, Category.id != category_id)
+        )
     ).first()
     if existing:
         raise HTTPException(status_code=400, detail="Categoria com este nome já existe")
     
+    stamp = [Category]
+    if db_category.name != category.name:
+        # O nome da categoria faz parte da resposta dos produtos
+        await session.exec(
+            update(Product)
+            .where(Product.category_id == category_id)
+            .values(change_seq=PENDING_CHANGE_SEQ)
+        )
+        stamp.append(Product)
     db_category.name = category.name
+    db_category.change_seq = PENDING_CHANGE_SEQ
     session.add(db_category)
-    session.commit()
-    session.refresh(db_category)
+    await notify_categories_changed(session)
+    await bump_catalog_version(session, *stamp)
+    await session.commit()
+    await session.refresh(db_category)
+    invalidate_category_cache()
     return CategoryResponse.model_validate(db_category)
 
 
 @router.delete("/{category_id}/", response_model=CategoryResponse)
 async def delete_category(*, session: ActiveSession, category_id: int):
-    category = session.exec(select(Category).where(Category.id == category_id)).first()
+    category = (await session.exec(select(Category).where(Category.id == category_id))).first()
     if not category:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
     
-    # Verificar se há produtos associados a esta categoria
-    from starphone_api.models import Product
-    products = session.exec(select(Product).where(Product.category_id == category_id)).all()
-    if products:
-        count = len(products)
+    # Verificar se há produtos associados a esta categoria (contagem pelo índice)
+    count = (
+        await session.exec(
+            select(func.count()).select_from(Product).where(Product.category_id == category_id)
+        )
+    ).one()
+    if count:
         raise HTTPException(
             status_code=400,
             detail=f"Não é possível excluir categoria com {count} produto(s) associado(s). Remova os produtos antes de excluir a categoria."
         )
     
-    session.delete(category)
-    session.commit()
+    await session.delete(category)
+    await notify_categories_changed(session)
+    await bump_catalog_version(session, tombstones=[("category", category_id)])
+    await session.commit()
+    invalidate_category_cache()
     return CategoryResponse.model_validate(category)
 
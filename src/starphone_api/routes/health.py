@@ -0,0 +1,31 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from starphone_api.serializers.system import ReadinessResponse
+from starphone_api.warmup import readiness
+
+router = APIRouter()
+
+
+@router.get("/live")
+async def live():
+    """
+    O processo está de pé (não consulta o banco).
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+async def ready():
+    """
+    O worker terminou o aquecimento e pode receber tráfego.
+    Responde 503 enquanto isso não acontece.
+    """
+    content = ReadinessResponse(
+        ready=readiness.ready,
+        warmup=readiness.steps,
+        error=readiness.error,
+    )
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content=content.model_dump())
+    return content
@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import union_all
+from sqlmodel import func, select
+
+from starphone_api.auth import get_current_active_admin
+from starphone_api.db import ReadSession
+from starphone_api.models import Category, InventoryDelta, InventorySummary
+from starphone_api.serializers.inventory import (
+    CategoryValuationResponse,
+    InventoryValuationResponse,
+)
+
+router = APIRouter(dependencies=[Depends(get_current_active_admin)])
+
+
+@router.get("/valuation", response_model=InventoryValuationResponse)
+async def get_inventory_valuation(*, session: ReadSession):
+    """
+    Valor de custo (`cost_value * quantity`) e lucro potencial
+    (`profit_value * quantity`) do estoque, por categoria e no total.
+    Lê o resumo mantido incrementalmente mais as variações ainda não
+    compactadas: custo proporcional ao número de categorias (e de escritas
+    dos últimos segundos), não de produtos.
+    """
+    rows = union_all(
+        *(
+            select(
+                model.category_id,
+                model.product_count,
+                model.total_units,
+                model.total_cost,
+                model.total_profit,
+            )
+            for model in (InventorySummary, InventoryDelta)
+        )
+    ).subquery("inventory")
+    product_count = func.sum(rows.c.product_count)
+    stmt = (
+        select(
+            rows.c.category_id,
+            Category.name,
+            product_count.label("product_count"),
+            func.sum(rows.c.total_units).label("total_units"),
+            func.sum(rows.c.total_cost).label("total_cost"),
+            func.sum(rows.c.total_profit).label("total_profit"),
+        )
+        .join(Category, Category.id == rows.c.category_id)
+        .group_by(rows.c.category_id, Category.name)
+        .having(product_count > 0)
+        .order_by(Category.name)
+    )
+    categories = [
+        CategoryValuationResponse.model_validate(row._mapping)
+        for row in (await session.exec(stmt)).all()
+    ]
+    return InventoryValuationResponse(
+        categories=categories,
+        product_count=sum(category.product_count for category in categories),
+        total_units=sum(category.total_units for category in categories),
+        total_cost=sum((category.total_cost for category in categories), Decimal("0")),
+        total_profit=sum((category.total_profit for category in categories), Decimal("0")),
+    )
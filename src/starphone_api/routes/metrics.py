@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Response
+
+from starphone_api.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Métricas no formato texto do Prometheus, somadas entre os workers
+    quando PROMETHEUS_MULTIPROC_DIR está definido (ver metrics.py).
+    """
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,97 +1,585 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import selectinload
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from sqlalchemy import (
+    CTE,
+    Integer,
+    Row,
+    Select,
+    Table,
+    case,
+    column,
+    func,
+    insert,
+    or_,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy import select as sa_select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, selectinload
 from sqlmodel import select
 
-from starphone_api.auth import get_current_user
-from starphone_api.db import ActiveSession
-from starphone_api.models import Category, Product, User
-from starphone_api.serializers.product import ProductRequest, ProductResponse
+from starphone_api.auth import get_current_active_admin, get_current_user
+from starphone_api.catalog import (
+    PENDING_CHANGE_SEQ,
+    bump_catalog_version,
+    catalog_etag,
+    etag_matches,
+    get_catalog_version,
+    not_modified,
+    set_etag,
+)
+from starphone_api.db import ActiveSession, ReadSession
+from starphone_api.export import ExportFormat, export_response
+from starphone_api.models import CatalogTombstone, Category, Product, User
+from starphone_api.pagination import decode_cursor, encode_cursor
+from starphone_api.product_import import ImportFormat, ProductImporter
+from starphone_api.query_budget import query_budget
+from starphone_api.serializers.product import (
+    ProductImportResponse,
+    ProductBatchResponse,
+    ProductChangesResponse,
+    ProductPageResponse,
+    ProductRecord,
+    ProductRequest,
+    ProductResponse,
+    StockAdjustmentBatchRequest,
+    StockAdjustmentRequest,
+    StockLevelResponse,
+    product_batch_json,
+    product_changes_json,
+    product_list_json,
+    product_page_json,
+)
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 200
+MAX_SEARCH_RESULTS = 50
+# Termos mais curtos que um trigrama não usam o índice GIN do pg_trgm
+MIN_TRIGRAM_TERM = 3
+MAX_BATCH_IDS = 200
+
+ProductSort = Literal["id", "name", "quantity"]
+SortOrder = Literal["asc", "desc"]
+
+PRODUCT_SORT_COLUMNS = {
+    "id": Product.id,
+    "name": Product.name,
+    "quantity": Product.quantity,
+}
+
+# Nomes (padrão do PostgreSQL) das foreign keys que viram erro do cliente;
+# qualquer outra violação de integridade é erro do servidor
+PRODUCT_CATEGORY_FKEY = "product_category_id_fkey"
+SALE_ITEM_PRODUCT_FKEY = "sale_item_product_id_fkey"
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _case_variants(term: str) -> list[str]:
+    """
+    Todas as combinações de maiúsculas e minúsculas de um termo curto
+    ("ca" -> "CA", "Ca", "cA", "ca").
+    """
+    variants = [""]
+    for char in term:
+        variants = [variant + c for variant in variants for c in {char.upper(), char.lower()}]
+    return sorted(set(variants))
+
+
+def _product_response_stmt(written: CTE | Table) -> Select:
+    """
+    Projeta as linhas de produto (a tabela ou um INSERT/UPDATE ... RETURNING
+    em CTE) junto com o nome da categoria e dos usuários, para montar a
+    resposta sem consultas extras.
+    """
+    creator = aliased(User)
+    updater = aliased(User)
+    return (
+        sa_select(
+            written.c.id,
+            written.c.name,
+            written.c.quantity,
+            written.c.cost_value,
+            written.c.profit_value,
+            Category.id.label("category_id"),
+            Category.name.label("category_name"),
+            creator.id.label("created_by_id"),
+            creator.fullname.label("created_by_name"),
+            creator.email.label("created_by_email"),
+            updater.id.label("updated_by_id"),
+            updater.fullname.label("updated_by_name"),
+            updater.email.label("updated_by_email"),
+        )
+        .join(Category, Category.id == written.c.category_id)
+        .outerjoin(creator, creator.id == written.c.created_by)
+        .outerjoin(updater, updater.id == written.c.updated_by)
+    )
+
+
+def _violated_constraint(exc: IntegrityError) -> Optional[str]:
+    """
+    Nome da restrição violada, informado pelo driver do PostgreSQL.
+    """
+    diag = getattr(exc.orig, "diag", None)
+    return getattr(diag, "constraint_name", None)
+
+
+def _product_record(row: Row) -> ProductRecord:
+    """
+    Converte uma linha de `_product_response_stmt` no formato de resposta.
+    """
+    return {
+        "id": row.id,
+        "name": row.name,
+        "category": {"id": row.category_id, "name": row.category_name},
+        "quantity": row.quantity,
+        "cost_value": row.cost_value,
+        "profit_value": row.profit_value,
+        "created_by": (
+            {"id": row.created_by_id, "name": row.created_by_name, "email": row.created_by_email}
+            if row.created_by_email is not None
+            else None
+        ),
+        "updated_by": (
+            {"id": row.updated_by_id, "name": row.updated_by_name, "email": row.updated_by_email}
+            if row.updated_by_email is not None
+            else None
+        ),
+    }
+
+
+def _product_response_from_row(row: Row) -> ProductResponse:
+    return ProductResponse.model_validate(_product_record(row))
+
+
+def _product_detail_stmt(product_id: int):
+    """
+    Produto com categoria e usuários de auditoria carregados via selectinload.
+    """
+    return (
+        select(Product)
+        .where(Product.id == product_id)
+        .options(
+            selectinload(Product.category),
+            selectinload(Product.created_by_user),
+            selectinload(Product.updated_by_user),
+        )
+    )
+
+
+def _json_response(content: bytes, etag: Optional[str] = None) -> Response:
+    response = Response(content=content, media_type="application/json")
+    if etag is not None:
+        set_etag(response, etag)
+    return response
+
 
 @router.post("/", response_model=ProductResponse)
+@query_budget(3)
 async def create_product(
     *,
     session: ActiveSession,
     product: ProductRequest,
     current_user: User = Depends(get_current_user),  # Obtém o usuário do token JWT
 ):
-    # Verificar se a categoria existe
-    category = session.exec(select(Category).where(Category.id == product.category_id)).first()
-    if not category:
-        raise HTTPException(status_code=404, detail="Categoria não encontrada")
-    
-    # Criar produto com os dados do usuário autenticado obtido do token JWT
-    db_product = Product(
-        name=product.name,
-        category_id=product.category_id,
-        quantity=product.quantity,
-        cost_value=product.cost_value,
-        profit_value=product.profit_value,
-        created_by=current_user.id,  # ID do usuário obtido do token JWT
-        updated_by=current_user.id,  # ID do usuário obtido do token JWT
+    # INSERT ... RETURNING + projeção da resposta em um único comando;
+    # a existência da categoria é garantida pela foreign key
+    written = (
+        insert(Product)
+        .values(
+            name=product.name,
+            category_id=product.category_id,
+            quantity=product.quantity,
+            cost_value=product.cost_value,
+            profit_value=product.profit_value,
+            created_by=current_user.id,  # ID do usuário obtido do token JWT
+            updated_by=current_user.id,  # ID do usuário obtido do token JWT
+            change_seq=PENDING_CHANGE_SEQ,
+        )
+        .returning(*Product.__table__.c)
+        .cte("written")
     )
-    session.add(db_product)
-    session.commit()
-    session.refresh(db_product)
-    
-    # Carregar relacionamentos
+    try:
+        row = (await session.exec(_product_response_stmt(written))).first()
+        if row is not None:
+            await bump_catalog_version(session, Product)
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        if _violated_constraint(exc) != PRODUCT_CATEGORY_FKEY:
+            raise
+        raise HTTPException(status_code=404, detail="Categoria não encontrada") from exc
+
+    return _product_response_from_row(row)
+
+
+@router.post("/import", response_model=ProductImportResponse)
+async def import_products(
+    *,
+    request: Request,
+    session: ActiveSession,
+    file_format: ImportFormat = Query(default="csv", alias="format"),
+    all_or_nothing: bool = False,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Importa produtos em lote a partir de um CSV (com cabeçalho) ou NDJSON
+    enviado no corpo da requisição. O corpo é lido em streaming.
+
+    Colunas: name, category_id ou category (nome), quantity, cost_value,
+    profit_value. Linhas inválidas são reportadas por número de linha; com
+    `all_or_nothing=true` qualquer erro desfaz a importação inteira.
+    """
+    importer = ProductImporter(session, user_id=current_user.id)
+    return await importer.run(
+        request.stream(),
+        file_format=file_format,
+        all_or_nothing=all_or_nothing,
+    )
+
+
+@router.get("/export", dependencies=[Depends(get_current_active_admin)])
+async def export_products(
+    *,
+    export_format: ExportFormat = Query(default="csv", alias="format"),
+):
+    """
+    Exporta o catálogo completo em CSV ou NDJSON (streaming).
+    Apenas as colunas necessárias são lidas, com cursor no servidor.
+    """
     stmt = (
-        select(Product)
-        .where(Product.id == db_product.id)
-        .options(
-            selectinload(Product.category),
-            selectinload(Product.created_by_user),
-            selectinload(Product.updated_by_user),
+        sa_select(
+            Product.id,
+            Product.name,
+            Category.name.label("category"),
+            Product.quantity,
+            Product.cost_value,
+            Product.profit_value,
         )
+        .join(Category, Category.id == Product.category_id)
+        .order_by(Product.id)
     )
-    db_product = session.exec(stmt).first()
-    
-    return ProductResponse.model_validate(db_product)
+    return export_response(stmt, export_format, filename="produtos")
 
 
-@router.get("/", response_model=list[ProductResponse])
+@router.get("/", response_model=ProductPageResponse)
+@query_budget(3)
 async def get_products(
     *,
-    session: ActiveSession,
+    session: ReadSession,
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: User = Depends(get_current_user),
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: ProductSort = "id",
+    order: SortOrder = "asc",
+    category_id: Optional[int] = Query(default=None, gt=0),
+    name_prefix: Optional[str] = Query(default=None, min_length=1, max_length=255),
+    in_stock: Optional[bool] = None,
+    max_quantity: Optional[int] = Query(default=None, ge=0),
+):
+    """
+    Lista produtos com paginação por cursor (keyset) sobre `(sort, id)`.
+    O custo de qualquer página é o mesmo da primeira, pois a consulta
+    parte do índice a partir da última linha vista em vez de usar OFFSET.
+
+    Seleciona só as colunas da resposta (com joins) e serializa as linhas
+    direto para JSON, sem instanciar objetos ORM nem validar duas vezes.
+    """
+    # Responde 304 antes de consultar os produtos se o catálogo não mudou
+    etag = catalog_etag(await get_catalog_version(session))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    sort_column = PRODUCT_SORT_COLUMNS[sort]
+    descending = order == "desc"
+
+    stmt = _product_response_stmt(Product.__table__)
+
+    # Filtros
+    if category_id is not None:
+        stmt = stmt.where(Product.category_id == category_id)
+    if name_prefix is not None:
+        stmt = stmt.where(Product.name.startswith(name_prefix, autoescape=True))
+    if in_stock is True:
+        stmt = stmt.where(Product.quantity > 0)
+    elif in_stock is False:
+        stmt = stmt.where(Product.quantity == 0)
+    if max_quantity is not None:
+        stmt = stmt.where(Product.quantity <= max_quantity)
+
+    # Continuar a partir da última linha da página anterior
+    if cursor is not None:
+        data = decode_cursor(cursor)
+        key_type = str if sort == "name" else int
+        if (
+            data.get("sort") != sort
+            or data.get("order") != order
+            or not isinstance(data.get("id"), int)
+            or not isinstance(data.get("key"), key_type)
+        ):
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        if sort == "id":
+            position = Product.id < data["id"] if descending else Product.id > data["id"]
+        else:
+            keyset = tuple_(sort_column, Product.id)
+            last = (data["key"], data["id"])
+            position = keyset < last if descending else keyset > last
+        stmt = stmt.where(position)
+
+    if sort == "id":
+        order_by = [Product.id.desc() if descending else Product.id.asc()]
+    elif descending:
+        order_by = [sort_column.desc(), Product.id.desc()]
+    else:
+        order_by = [sort_column.asc(), Product.id.asc()]
+
+    # Busca uma linha extra para saber se existe próxima página
+    stmt = stmt.order_by(*order_by).limit(limit + 1)
+    rows = (await session.exec(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1]
+        next_cursor = encode_cursor(
+            {
+                "sort": sort,
+                "order": order,
+                "key": getattr(last_row, sort),
+                "id": last_row.id,
+            }
+        )
+
+    content = product_page_json.dump_json(
+        {"items": [_product_record(row) for row in rows], "next_cursor": next_cursor}
+    )
+    return _json_response(content, etag)
+
+
+@router.get("/batch", response_model=ProductBatchResponse)
+@query_budget(3)
+async def get_products_batch(
+    *,
+    session: ReadSession,
+    if_none_match: Optional[str] = Header(default=None),
     current_user: User = Depends(get_current_user),
+    ids: list[int] = Query(min_length=1, max_length=MAX_BATCH_IDS),
 ):
+    """
+    Busca vários produtos de uma vez (ex.: reabrir um carrinho salvo):
+    `GET /products/batch?ids=1&ids=2&ids=3`.
+
+    Uma única consulta com IN, na mesma projeção da listagem. Os itens
+    voltam na ordem pedida (sem repetições) e os ids inexistentes vão em
+    `missing_ids`.
+    """
+    etag = catalog_etag(await get_catalog_version(session))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    product_ids = list(dict.fromkeys(ids))
+    stmt = _product_response_stmt(Product.__table__).where(Product.id.in_(product_ids))
+    rows = {row.id: row for row in (await session.exec(stmt)).all()}
+
+    content = product_batch_json.dump_json(
+        {
+            "items": [_product_record(rows[product_id]) for product_id in product_ids if product_id in rows],
+            "missing_ids": [product_id for product_id in product_ids if product_id not in rows],
+        }
+    )
+    return _json_response(content, etag)
+
+
+@router.get("/changes", response_model=ProductChangesResponse)
+@query_budget(6)
+async def get_product_changes(
+    *,
+    session: ReadSession,
+    current_user: User = Depends(get_current_user),
+    since: int = Query(ge=0),
+    limit: int = Query(default=MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """
+    Sincronização incremental para terminais com cache local: produtos e
+    categorias criados ou alterados depois da versão `since`, e os ids
+    excluídos. `since=0` devolve o catálogo inteiro.
+
+    Uma alteração de nome ou email de usuário não regrava os produtos dele:
+    vem em `users` ({id, name, email}), e o terminal atualiza os
+    `created_by`/`updated_by` locais com o mesmo id.
+
+    Os produtos são paginados por cursor (keyset) sobre `(change_seq, id)`;
+    categorias, exclusões e usuários vêm só na primeira página. Siga `next_cursor`
+    (com o mesmo `since`) até ele vir nulo e só então envie o `seq` como
+    `since` da próxima sincronização.
+
+    A versão é lida antes das linhas e todas as páginas se limitam a ela:
+    uma escrita concluída no meio da sincronização fica para a próxima,
+    nunca é perdida nem aparece pela metade.
+    """
+    if cursor is not None:
+        data = decode_cursor(cursor)
+        if (
+            data.get("since") != since
+            or not isinstance(data.get("seq"), int)
+            or not isinstance(data.get("change_seq"), int)
+            or not isinstance(data.get("id"), int)
+        ):
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        seq = data["seq"]
+    else:
+        seq = await get_catalog_version(session)
+        if since > seq:
+            raise HTTPException(
+                status_code=409,
+                detail="Versão posterior à do catálogo, sincronize novamente com since=0",
+            )
+
+    content = {
+        "seq": seq,
+        "products": [],
+        "deleted_product_ids": [],
+        "categories": [],
+        "deleted_category_ids": [],
+        "users": [],
+        "next_cursor": None,
+    }
+    if since == seq:
+        return _json_response(product_changes_json.dump_json(content))
+
+    # Busca uma linha extra para saber se existe próxima página
     stmt = (
-        select(Product)
-        .options(
-            selectinload(Product.category),
-            selectinload(Product.created_by_user),
-            selectinload(Product.updated_by_user),
+        _product_response_stmt(Product.__table__)
+        .add_columns(Product.change_seq)
+        .where(Product.change_seq > since, Product.change_seq <= seq)
+    )
+    if cursor is not None:
+        stmt = stmt.where(tuple_(Product.change_seq, Product.id) > (data["change_seq"], data["id"]))
+    stmt = stmt.order_by(Product.change_seq, Product.id).limit(limit + 1)
+    rows = (await session.exec(stmt)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        content["next_cursor"] = encode_cursor(
+            {"since": since, "seq": seq, "change_seq": rows[-1].change_seq, "id": rows[-1].id}
+        )
+    content["products"] = [_product_record(row) for row in rows]
+
+    if cursor is None:
+        categories = await session.exec(
+            sa_select(Category.id, Category.name)
+            .where(Category.change_seq > since, Category.change_seq <= seq)
+            .order_by(Category.change_seq, Category.id)
+        )
+        content["categories"] = [{"id": row.id, "name": row.name} for row in categories.all()]
+
+        tombstones = await session.exec(
+            sa_select(CatalogTombstone.entity, CatalogTombstone.entity_id)
+            .where(CatalogTombstone.change_seq > since, CatalogTombstone.change_seq <= seq)
+            .order_by(CatalogTombstone.change_seq)
+        )
+        for entity, entity_id in tombstones.all():
+            content[f"deleted_{entity}_ids"].append(entity_id)
+
+        users = await session.exec(
+            sa_select(User.id, User.fullname, User.email)
+            .where(User.change_seq > since, User.change_seq <= seq)
+            .order_by(User.change_seq, User.id)
+        )
+        content["users"] = [
+            {"id": row.id, "name": row.fullname, "email": row.email} for row in users.all()
+        ]
+
+    return _json_response(product_changes_json.dump_json(content))
+
+
+@router.get("/search", response_model=list[ProductResponse])
+@query_budget(2)
+async def search_products(
+    *,
+    session: ReadSession,
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=20, ge=1, le=MAX_SEARCH_RESULTS),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Busca produtos por parte do nome (caixa de busca do PDV).
+    Usa o índice trigram (pg_trgm) de `product.name`; nomes que começam
+    com o termo vêm primeiro, seguidos pelos mais similares.
+
+    Com 1 ou 2 caracteres (primeiras teclas) o trigram não usa o índice:
+    a busca é só por prefixo, sem diferenciar maiúsculas, pelo índice
+    btree de `name` (o mesmo do filtro `name_prefix`), em ordem alfabética.
+    """
+    term = q.strip()
+    if not term:
+        return _json_response(b"[]")
+
+    if len(term) < MIN_TRIGRAM_TERM:
+        # Uma faixa do índice por combinação de caixa (no máximo quatro)
+        prefixes = [
+            Product.name.like(f"{_escape_like(variant)}%", escape="\\")
+            for variant in _case_variants(term)
+        ]
+        stmt = (
+            _product_response_stmt(Product.__table__)
+            .where(or_(*prefixes))
+            .order_by(Product.name, Product.id)
+            .limit(limit)
         )
+        rows = (await session.exec(stmt)).all()
+        return _json_response(product_list_json.dump_json([_product_record(row) for row in rows]))
+
+    # Padrões montados em Python (um único parâmetro) para o planner
+    # conseguir usar o índice trigram
+    escaped = _escape_like(term)
+    starts_with = Product.name.ilike(f"{escaped}%", escape="\\")
+    stmt = (
+        _product_response_stmt(Product.__table__)
+        .where(Product.name.ilike(f"%{escaped}%", escape="\\"))
+        .order_by(
+            case((starts_with, 0), else_=1),
+            func.similarity(Product.name, term).desc(),
+            Product.name,
+            Product.id,
+        )
+        .limit(limit)
     )
-    products = session.exec(stmt).all()
-    return [ProductResponse.model_validate(product) for product in products]
+    rows = (await session.exec(stmt)).all()
+    return _json_response(product_list_json.dump_json([_product_record(row) for row in rows]))
 
 
 @router.get("/{product_id}/", response_model=ProductResponse)
+@query_budget(6)
 async def get_product(
     *,
-    session: ActiveSession,
+    session: ReadSession,
+    response: Response,
     product_id: int,
+    if_none_match: Optional[str] = Header(default=None),
     current_user: User = Depends(get_current_user),
 ):
-    stmt = (
-        select(Product)
-        .where(Product.id == product_id)
-        .options(
-            selectinload(Product.category),
-            selectinload(Product.created_by_user),
-            selectinload(Product.updated_by_user),
-        )
-    )
-    product = session.exec(stmt).first()
+    # Responde 304 antes de carregar o produto se o catálogo não mudou
+    etag = catalog_etag(await get_catalog_version(session))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    product = (await session.exec(_product_detail_stmt(product_id))).first()
     if not product:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
+    set_etag(response, etag)
     return ProductResponse.model_validate(product)
 
 
 @router.put("/{product_id}/", response_model=ProductResponse)
+@query_budget(3)
 async def update_product(
     *,
     session: ActiveSession,
@@ -99,43 +587,146 @@ async def update_product(
     product: ProductRequest,
     current_user: User = Depends(get_current_user),  # Obtém o usuário do token JWT
 ):
-    db_product = session.exec(select(Product).where(Product.id == product_id)).first()
-    if not db_product:
+    # UPDATE ... RETURNING + projeção da resposta em um único comando;
+    # a existência da categoria é garantida pela foreign key
+    written = (
+        update(Product)
+        .where(Product.id == product_id)
+        .values(
+            name=product.name,
+            category_id=product.category_id,
+            quantity=product.quantity,
+            cost_value=product.cost_value,
+            profit_value=product.profit_value,
+            updated_by=current_user.id,  # ID do usuário obtido do token JWT
+            change_seq=PENDING_CHANGE_SEQ,
+        )
+        .returning(*Product.__table__.c)
+        .cte("written")
+    )
+    try:
+        row = (await session.exec(_product_response_stmt(written))).first()
+        if row is not None:
+            await bump_catalog_version(session, Product)
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        if _violated_constraint(exc) != PRODUCT_CATEGORY_FKEY:
+            raise
+        raise HTTPException(status_code=404, detail="Categoria não encontrada") from exc
+
+    if row is None:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
-    
-    # Verificar se a categoria existe
-    category = session.exec(select(Category).where(Category.id == product.category_id)).first()
-    if not category:
-        raise HTTPException(status_code=404, detail="Categoria não encontrada")
-    
-    # Atualizar produto com os dados do usuário autenticado obtido do token JWT
-    db_product.name = product.name
-    db_product.category_id = product.category_id
-    db_product.quantity = product.quantity
-    db_product.cost_value = product.cost_value
-    db_product.profit_value = product.profit_value
-    db_product.updated_by = current_user.id  # ID do usuário obtido do token JWT
-    
-    session.add(db_product)
-    session.commit()
-    session.refresh(db_product)
-    
-    # Carregar relacionamentos
+
+    return _product_response_from_row(row)
+
+
+@router.post("/stock/", response_model=list[StockLevelResponse])
+@query_budget(4)
+async def adjust_stock_batch(
+    *,
+    session: ActiveSession,
+    adjustment: StockAdjustmentBatchRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Ajusta o estoque de vários produtos em um único UPDATE ... FROM (VALUES).
+    Tudo ou nada: se algum produto não existir ou ficar com estoque
+    negativo, nenhum ajuste é aplicado.
+    """
+    # Soma os deltas de linhas repetidas para o mesmo produto
+    deltas: dict[int, int] = {}
+    for item in adjustment.items:
+        deltas[item.product_id] = deltas.get(item.product_id, 0) + item.delta
+
+    # Trava as linhas em ordem crescente de id (mesma ordem do checkout)
+    # para que lotes concorrentes não entrem em deadlock
+    await session.exec(
+        select(Product.id)
+        .where(Product.id.in_(deltas))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+
+    changes = values(
+        column("id", Integer),
+        column("delta", Integer),
+        name="changes",
+    ).data(sorted(deltas.items()))
     stmt = (
-        select(Product)
-        .where(Product.id == db_product.id)
-        .options(
-            selectinload(Product.category),
-            selectinload(Product.created_by_user),
-            selectinload(Product.updated_by_user),
+        update(Product)
+        .where(
+            Product.id == changes.c.id,
+            Product.quantity + changes.c.delta >= 0,
         )
+        .values(
+            quantity=Product.quantity + changes.c.delta,
+            updated_by=current_user.id,
+            change_seq=PENDING_CHANGE_SEQ,
+        )
+        .returning(Product.id, Product.quantity)
     )
-    db_product = session.exec(stmt).first()
-    
-    return ProductResponse.model_validate(db_product)
+    rows = (await session.exec(stmt)).all()
+
+    failed = sorted(set(deltas) - {row.id for row in rows})
+    if failed:
+        await session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Produto inexistente ou estoque insuficiente",
+                "product_ids": failed,
+            },
+        )
+
+    await bump_catalog_version(session, Product)
+    await session.commit()
+    return [StockLevelResponse(product_id=row.id, quantity=row.quantity) for row in rows]
+
+
+@router.post("/{product_id}/stock/", response_model=ProductResponse)
+@query_budget(4)
+async def adjust_stock(
+    *,
+    session: ActiveSession,
+    product_id: int,
+    adjustment: StockAdjustmentRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Soma `delta` ao estoque do produto (negativo para baixa) de forma
+    atômica, sem ler e regravar a quantidade: o próprio UPDATE condicional
+    impede que o estoque fique negativo sob concorrência.
+    """
+    written = (
+        update(Product)
+        .where(
+            Product.id == product_id,
+            Product.quantity + adjustment.delta >= 0,
+        )
+        .values(
+            quantity=Product.quantity + adjustment.delta,
+            updated_by=current_user.id,
+            change_seq=PENDING_CHANGE_SEQ,
+        )
+        .returning(*Product.__table__.c)
+        .cte("written")
+    )
+    row = (await session.exec(_product_response_stmt(written))).first()
+    if row is None:
+        await session.rollback()
+        exists = (await session.exec(select(Product.id).where(Product.id == product_id))).first()
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Produto não encontrado")
+        raise HTTPException(status_code=409, detail="Estoque insuficiente")
+
+    await bump_catalog_version(session, Product)
+    await session.commit()
+    return _product_response_from_row(row)
 
 
 @router.delete("/{product_id}/", response_model=ProductResponse)
+@query_budget(7)
 async def delete_product(
     *,
     session: ActiveSession,
@@ -143,23 +734,25 @@ async def delete_product(
     current_user: User = Depends(get_current_user),
 ):
     # Carregar o produto com todos os relacionamentos usando selectinload
-    stmt = (
-        select(Product)
-        .where(Product.id == product_id)
-        .options(
-            selectinload(Product.category),
-            selectinload(Product.created_by_user),
-            selectinload(Product.updated_by_user),
-        )
-    )
-    product = session.exec(stmt).first()
+    product = (await session.exec(_product_detail_stmt(product_id))).first()
     if not product:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
     
     # Criar uma cópia dos dados para o response antes de deletar
     response_data = ProductResponse.model_validate(product)
     
-    session.delete(product)
-    session.commit()
+    try:
+        await session.delete(product)
+        await bump_catalog_version(session, tombstones=[("product", product_id)])
+        await session.commit()
+    except IntegrityError as exc:
+        # Produtos referenciados por itens de venda não podem ser removidos
+        await session.rollback()
+        if _violated_constraint(exc) != SALE_ITEM_PRODUCT_FKEY:
+            raise
+        raise HTTPException(
+            status_code=400,
+            detail="Não é possível excluir produto com vendas registradas.",
+        ) from exc
     return response_data
 
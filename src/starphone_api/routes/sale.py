@@ -0,0 +1,134 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import Integer, column, insert, update, values
+from sqlmodel import select
+
+from starphone_api.auth import get_current_user
+from starphone_api.catalog import PENDING_CHANGE_SEQ, bump_catalog_version
+from starphone_api.db import ActiveSession
+from starphone_api.models import Product, Sale, SaleItem, User
+from starphone_api.query_budget import query_budget
+from starphone_api.serializers.sale import CheckoutRequest, SaleItemResponse, SaleResponse
+
+router = APIRouter()
+
+
+@router.post("/checkout/", response_model=SaleResponse)
+@query_budget(6)
+async def checkout(
+    *,
+    session: ActiveSession,
+    cart: CheckoutRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Finaliza uma venda: baixa o estoque de todos os itens e registra a venda
+    em uma única transação, com número fixo de comandos.
+
+    As linhas de produto são travadas (SELECT ... FOR UPDATE) sempre em
+    ordem crescente de id, então dois caixas com carrinhos sobrepostos
+    esperam um pelo outro em vez de entrar em deadlock.
+    """
+    # Agrupa linhas repetidas do mesmo produto
+    quantities: dict[int, int] = {}
+    for item in cart.items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    product_ids = sorted(quantities)
+
+    # 1. Trava os produtos em ordem determinística
+    stmt = (
+        select(Product.id, Product.name, Product.quantity, Product.cost_value, Product.profit_value)
+        .where(Product.id.in_(product_ids))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+    products = {row.id: row for row in (await session.exec(stmt)).all()}
+
+    missing = [product_id for product_id in product_ids if product_id not in products]
+    if missing:
+        await session.rollback()
+        raise HTTPException(
+            status_code=404,
+            detail={"message": "Produto não encontrado", "product_ids": missing},
+        )
+
+    insufficient = [
+        product_id
+        for product_id in product_ids
+        if products[product_id].quantity < quantities[product_id]
+    ]
+    if insufficient:
+        await session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Estoque insuficiente", "product_ids": insufficient},
+        )
+
+    # 2. Baixa o estoque de todos os itens em um único UPDATE
+    changes = values(
+        column("id", Integer),
+        column("quantity", Integer),
+        name="changes",
+    ).data([(product_id, quantities[product_id]) for product_id in product_ids])
+    await session.exec(
+        update(Product)
+        .where(Product.id == changes.c.id)
+        .values(
+            quantity=Product.quantity - changes.c.quantity,
+            updated_by=current_user.id,
+            change_seq=PENDING_CHANGE_SEQ,
+        )
+    )
+
+    # 3. Registra a venda e os itens
+    items = []
+    total = Decimal("0")
+    for product_id in product_ids:
+        product = products[product_id]
+        unit_price = product.cost_value + product.profit_value
+        subtotal = unit_price * quantities[product_id]
+        total += subtotal
+        items.append(
+            SaleItemResponse(
+                product_id=product_id,
+                name=product.name,
+                quantity=quantities[product_id],
+                unit_price=unit_price,
+                subtotal=subtotal,
+            )
+        )
+
+    created_at = datetime.now(timezone.utc)
+    sale_id = (
+        await session.exec(
+            insert(Sale)
+            .values(created_at=created_at, created_by=current_user.id, total=total)
+            .returning(Sale.id)
+        )
+    ).scalar_one()
+    await session.exec(
+        insert(SaleItem),
+        params=[
+            {
+                "sale_id": sale_id,
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "unit_cost": products[item.product_id].cost_value,
+                "unit_price": item.unit_price,
+            }
+            for item in items
+        ],
+    )
+
+    await bump_catalog_version(session, Product)
+    await session.commit()
+
+    return SaleResponse(
+        id=sale_id,
+        created_at=created_at,
+        created_by=current_user.id,
+        total=total,
+        items=items,
+    )
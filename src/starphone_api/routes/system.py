@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends
+
+from starphone_api.auth import current_user_cache, get_current_active_admin
+from starphone_api.db import pool_stats
+from starphone_api.login_admission import login_admission
+from starphone_api.routes.category import category_cache
+from starphone_api.security import hash_pool
+from starphone_api.serializers.system import (
+    CacheStatsResponse,
+    DbPoolStatsResponse,
+    HashPoolStatsResponse,
+    LoginAdmissionStatsResponse,
+)
+
+router = APIRouter(dependencies=[Depends(get_current_active_admin)])
+
+
+@router.get("/hash-pool", response_model=HashPoolStatsResponse)
+async def get_hash_pool_stats():
+    """
+    Retorna as métricas do pool de hash de senhas (Argon2).
+    `waiting` é a profundidade atual da fila.
+    """
+    return HashPoolStatsResponse(**hash_pool.stats())
+
+
+@router.get("/db-pool", response_model=DbPoolStatsResponse)
+async def get_db_pool_stats():
+    """
+    Retorna o estado do pool de conexões do banco neste worker:
+    conexões em uso, overflow, checkouts e tempo de espera acumulado.
+    """
+    return DbPoolStatsResponse(**pool_stats())
+
+
+@router.get("/caches", response_model=list[CacheStatsResponse])
+async def get_cache_stats():
+    """
+    Retorna tamanho, acertos (hits) e faltas (misses) dos caches em memória
+    deste worker.
+    """
+    caches = {
+        "current_user": current_user_cache,
+        "category": category_cache,
+    }
+    return [CacheStatsResponse(name=name, **cache.stats()) for name, cache in caches.items()]
+
+
+@router.get("/login-admission", response_model=LoginAdmissionStatsResponse)
+async def get_login_admission_stats():
+    """
+    Tentativas de login admitidas e recusadas (429) por limite de IP ou de
+    conta neste worker.
+    """
+    return LoginAdmissionStatsResponse(**login_admission.stats())
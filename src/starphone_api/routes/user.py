@@ -1,11 +1,18 @@
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import select
 
-from starphone_api.auth import get_current_active_admin
-from starphone_api.db import ActiveSession
+from starphone_api.auth import (
+    get_current_active_admin,
+    invalidate_cached_user,
+    notify_user_changed,
+)
+from starphone_api.catalog import PENDING_CHANGE_SEQ, bump_catalog_version
+from starphone_api.db import ActiveSession, ReadSession
+from starphone_api.export import ExportFormat, export_response
 from starphone_api.models import User
+from starphone_api.security import get_password_hash_async
 from starphone_api.serializers.user import UserRequest, UserResponse
 
 router = APIRouter(dependencies=[Depends(get_current_active_admin)])
@@ -25,24 +32,46 @@ async def create_user(*, session: ActiveSession, user: UserRequest):
         salary=user.salary,
         hiring_date=hiring_date,
         admin=user.admin,
-        password=user.password,
+        password=await get_password_hash_async(user.password),
         active=user.active if user.active is not None else True,
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     return UserResponse.model_validate(user)
 
 
 @router.get("/", response_model=list[UserResponse])
-async def get_users(*, session: ActiveSession):
-    users = session.exec(select(User)).all()
+async def get_users(*, session: ReadSession):
+    users = (await session.exec(select(User))).all()
     return [UserResponse.model_validate(user) for user in users]
 
 
+@router.get("/export")
+async def export_users(
+    *,
+    export_format: ExportFormat = Query(default="csv", alias="format"),
+):
+    """
+    Exporta a lista de funcionários em CSV ou NDJSON (streaming).
+    A senha nunca é incluída.
+    """
+    stmt = select(
+        User.id,
+        User.fullname,
+        User.email,
+        User.salary,
+        User.hiring_date,
+        User.resignation_date,
+        User.admin,
+        User.active,
+    ).order_by(User.id)
+    return export_response(stmt, export_format, filename="usuarios")
+
+
 @router.get("/{email}/", response_model=UserResponse)
-async def get_user_by_email(*, session: ActiveSession, email: str):
-    user = session.exec(select(User).where(User.email == email)).first()
+async def get_user_by_email(*, session: ReadSession, email: str):
+    user = (await session.exec(select(User).where(User.email == email))).first()
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     return UserResponse.model_validate(user)
@@ -50,27 +79,38 @@ async def get_user_by_email(*, session: ActiveSession, email: str):
 
 @router.put("/{email}/", response_model=UserResponse)
 async def update_user(*, session: ActiveSession, email: str, user: UserRequest):
-    db_user = session.exec(select(User).where(User.email == email)).first()
+    db_user = (await session.exec(select(User).where(User.email == email))).first()
     if not db_user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
+    # Nome e email do usuário aparecem nas respostas de produtos: a alteração
+    # vai para /products/changes como entrada própria, sem regravar os produtos
+    stamp = []
+    if (db_user.fullname, db_user.email) != (user.fullname, user.email):
+        db_user.change_seq = PENDING_CHANGE_SEQ
+        stamp.append(User)
+
     # hiring_date é imutável após criação
     db_user.fullname = user.fullname
     db_user.email = user.email
     db_user.salary = user.salary
     db_user.admin = user.admin
     if user.password:
-        db_user.password = user.password
+        db_user.password = await get_password_hash_async(user.password)
 
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await notify_user_changed(session, email, db_user.email)
+    if stamp:
+        await bump_catalog_version(session, *stamp)
+    await session.commit()
+    await session.refresh(db_user)
+    invalidate_cached_user(email, db_user.email)
     return UserResponse.model_validate(db_user)
 
 
 @router.patch("/{email}/deactivate/", response_model=UserResponse)
 async def deactivate_user(*, session: ActiveSession, email: str):
-    user = session.exec(select(User).where(User.email == email)).first()
+    user = (await session.exec(select(User).where(User.email == email))).first()
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     if not user.active:
@@ -78,14 +118,16 @@ async def deactivate_user(*, session: ActiveSession, email: str):
     user.resignation_date = datetime.now(timezone.utc)
     user.active = False
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await notify_user_changed(session, email)
+    await session.commit()
+    await session.refresh(user)
+    invalidate_cached_user(email)
     return UserResponse.model_validate(user)
 
 
 @router.patch("/{email}/reactivate/", response_model=UserResponse)
 async def reactivate_user(*, session: ActiveSession, email: str):
-    user = session.exec(select(User).where(User.email == email)).first()
+    user = (await session.exec(select(User).where(User.email == email))).first()
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     if user.active:
@@ -93,6 +135,8 @@ async def reactivate_user(*, session: ActiveSession, email: str):
     user.active = True
     user.resignation_date = None
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await notify_user_changed(session, email)
+    await session.commit()
+    await session.refresh(user)
+    invalidate_cached_user(email)
     return UserResponse.model_validate(user)
@@ -1,9 +1,27 @@
 from starphone_api.serializers.auth import LoginRequest, TokenResponse
+from starphone_api.serializers.inventory import InventoryValuationResponse
 from starphone_api.serializers.product import (
     CategoryRequest,
     CategoryResponse,
+    CategoryStatsResponse,
+    ProductImportResponse,
+    ProductImportRow,
+    ProductPageResponse,
+    ProductBatchResponse,
+    ProductChangesResponse,
     ProductRequest,
     ProductResponse,
+    StockAdjustmentBatchRequest,
+    StockAdjustmentRequest,
+    StockLevelResponse,
+)
+from starphone_api.serializers.sale import CheckoutRequest, SaleResponse
+from starphone_api.serializers.system import (
+    CacheStatsResponse,
+    DbPoolStatsResponse,
+    HashPoolStatsResponse,
+    LoginAdmissionStatsResponse,
+    ReadinessResponse,
 )
 from starphone_api.serializers.user import UserRequest, UserResponse
 
@@ -12,8 +30,25 @@ __all__ = [
     "UserResponse",
     "ProductRequest",
     "ProductResponse",
+    "ProductPageResponse",
+    "ProductBatchResponse",
+    "ProductChangesResponse",
+    "ProductImportRow",
+    "ProductImportResponse",
+    "StockAdjustmentRequest",
+    "StockAdjustmentBatchRequest",
+    "StockLevelResponse",
     "CategoryRequest",
     "CategoryResponse",
+    "CategoryStatsResponse",
     "LoginRequest",
     "TokenResponse",
+    "CheckoutRequest",
+    "InventoryValuationResponse",
+    "SaleResponse",
+    "HashPoolStatsResponse",
+    "DbPoolStatsResponse",
+    "CacheStatsResponse",
+    "LoginAdmissionStatsResponse",
+    "ReadinessResponse",
 ]
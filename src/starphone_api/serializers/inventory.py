@@ -0,0 +1,20 @@
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class CategoryValuationResponse(BaseModel):
+    category_id: int
+    name: str
+    product_count: int
+    total_units: int
+    total_cost: Decimal
+    total_profit: Decimal
+
+
+class InventoryValuationResponse(BaseModel):
+    categories: list[CategoryValuationResponse]
+    product_count: int
+    total_units: int
+    total_cost: Decimal
+    total_profit: Decimal
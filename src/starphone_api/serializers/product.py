@@ -1,7 +1,8 @@
 from decimal import Decimal
-from typing import Optional, Any
+from typing import Annotated, Optional, Any
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import AfterValidator, BaseModel, Field, TypeAdapter, model_validator
+from typing_extensions import TypedDict
 
 
 class CategoryResponse(BaseModel):
@@ -15,7 +16,16 @@ class CategoryRequest(BaseModel):
     name: str = Field(min_length=1, max_length=255)
 
 
+class CategoryStatsResponse(BaseModel):
+    id: int
+    name: str
+    product_count: int
+    total_units: int
+    stock_value: Decimal
+
+
 class UserInfoResponse(BaseModel):
+    id: int
     name: str
     email: str
 
@@ -54,6 +64,7 @@ class ProductResponse(BaseModel):
             # Transformar created_by_user em created_by
             if data.created_by_user:
                 result["created_by"] = {
+                    "id": data.created_by_user.id,
                     "name": data.created_by_user.fullname,
                     "email": data.created_by_user.email,
                 }
@@ -61,6 +72,7 @@ class ProductResponse(BaseModel):
             # Transformar updated_by_user em updated_by
             if data.updated_by_user:
                 result["updated_by"] = {
+                    "id": data.updated_by_user.id,
                     "name": data.updated_by_user.fullname,
                     "email": data.updated_by_user.email,
                 }
@@ -77,3 +89,143 @@ class ProductRequest(BaseModel):
     cost_value: Decimal = Field(gt=Decimal("0"))
     profit_value: Decimal = Field(ge=Decimal("0"))
 
+
+# Maior ajuste aceito em uma linha; mesmo somando um lote inteiro no mesmo
+# produto o resultado cabe na coluna INTEGER do estoque
+MAX_STOCK_DELTA = 1_000_000
+
+
+def _non_zero(delta: int) -> int:
+    if delta == 0:
+        raise ValueError("O ajuste de estoque não pode ser zero")
+    return delta
+
+
+StockDelta = Annotated[int, Field(ge=-MAX_STOCK_DELTA, le=MAX_STOCK_DELTA), AfterValidator(_non_zero)]
+
+
+class StockAdjustmentRequest(BaseModel):
+    delta: StockDelta
+
+
+class StockAdjustmentItem(BaseModel):
+    product_id: int = Field(gt=0)
+    delta: StockDelta
+
+
+class StockAdjustmentBatchRequest(BaseModel):
+    items: list[StockAdjustmentItem] = Field(min_length=1, max_length=1000)
+
+
+class StockLevelResponse(BaseModel):
+    product_id: int
+    quantity: int
+
+
+class ProductPageResponse(BaseModel):
+    items: list[ProductResponse]
+    next_cursor: Optional[str] = None
+
+
+class ProductBatchResponse(BaseModel):
+    items: list[ProductResponse]
+    missing_ids: list[int]
+
+
+class ProductChangesResponse(BaseModel):
+    """
+    Alterações do catálogo desde uma versão. `seq` é a versão atual, a ser
+    enviada como `since` na próxima sincronização depois da última página
+    (`next_cursor` nulo).
+    """
+
+    seq: int
+    products: list[ProductResponse]
+    deleted_product_ids: list[int]
+    categories: list[CategoryResponse]
+    deleted_category_ids: list[int]
+    users: list[UserInfoResponse]
+    next_cursor: Optional[str] = None
+
+
+class ProductImportRow(BaseModel):
+    """
+    Linha de importação em lote. Mesmas regras de `ProductRequest`, mas a
+    categoria pode ser informada pelo id ou pelo nome.
+    """
+
+    name: str = Field(min_length=1, max_length=255)
+    category_id: Optional[int] = Field(default=None, gt=0)
+    category: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    quantity: int = Field(default=0, ge=0)
+    cost_value: Decimal = Field(gt=Decimal("0"))
+    profit_value: Decimal = Field(ge=Decimal("0"))
+
+    @model_validator(mode="after")
+    def check_category(self) -> "ProductImportRow":
+        if self.category_id is None and self.category is None:
+            raise ValueError("Informe category_id ou category")
+        return self
+
+
+class ProductImportError(BaseModel):
+    line: int
+    errors: list[str]
+
+
+class ProductImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: list[ProductImportError]
+    errors_truncated: bool = False
+
+
+# Caminho rápido das listagens: registros montados direto das linhas da
+# consulta e serializados para JSON sem uma segunda validação.
+# Produzem o mesmo JSON de ProductResponse / ProductPageResponse.
+class CategoryRecord(TypedDict):
+    id: int
+    name: str
+
+
+class UserInfoRecord(TypedDict):
+    id: int
+    name: str
+    email: str
+
+
+class ProductRecord(TypedDict):
+    id: int
+    name: str
+    category: Optional[CategoryRecord]
+    quantity: int
+    cost_value: Decimal
+    profit_value: Decimal
+    created_by: Optional[UserInfoRecord]
+    updated_by: Optional[UserInfoRecord]
+
+
+class ProductPageRecord(TypedDict):
+    items: list[ProductRecord]
+    next_cursor: Optional[str]
+
+
+class ProductBatchRecord(TypedDict):
+    items: list[ProductRecord]
+    missing_ids: list[int]
+
+
+class ProductChangesRecord(TypedDict):
+    seq: int
+    products: list[ProductRecord]
+    deleted_product_ids: list[int]
+    categories: list[CategoryRecord]
+    deleted_category_ids: list[int]
+    users: list[UserInfoRecord]
+    next_cursor: Optional[str]
+
+
+product_list_json = TypeAdapter(list[ProductRecord])
+product_page_json = TypeAdapter(ProductPageRecord)
+product_batch_json = TypeAdapter(ProductBatchRecord)
+product_changes_json = TypeAdapter(ProductChangesRecord)
@@ -0,0 +1,29 @@
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import BaseModel, Field
+
+
+class CheckoutItem(BaseModel):
+    product_id: int = Field(gt=0)
+    quantity: int = Field(gt=0)
+
+
+class CheckoutRequest(BaseModel):
+    items: list[CheckoutItem] = Field(min_length=1, max_length=500)
+
+
+class SaleItemResponse(BaseModel):
+    product_id: int
+    name: str
+    quantity: int
+    unit_price: Decimal
+    subtotal: Decimal
+
+
+class SaleResponse(BaseModel):
+    id: int
+    created_at: datetime
+    created_by: int | None = None
+    total: Decimal
+    items: list[SaleItemResponse]
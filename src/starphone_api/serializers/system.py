@@ -0,0 +1,47 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class HashPoolStatsResponse(BaseModel):
+    max_workers: int
+    max_queue: int
+    in_flight: int
+    waiting: int
+    max_waiting: int
+    completed: int
+    rejected: int
+
+
+class DbPoolStatsResponse(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class CacheStatsResponse(BaseModel):
+    name: str
+    size: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
+
+
+class LoginAdmissionStatsResponse(BaseModel):
+    admitted: int
+    rejected_ip: int
+    rejected_account: int
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    # Duração de cada etapa do aquecimento, em segundos
+    warmup: dict[str, float]
+    error: Optional[str] = None
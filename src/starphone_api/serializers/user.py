@@ -1,9 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
-
-from starphone_api.security import get_password_hash
+from pydantic import BaseModel, EmailStr, Field
 
 
 class UserResponse(BaseModel):
@@ -27,9 +25,3 @@ class UserRequest(BaseModel):
     password: str | None = Field(default=None, min_length=8)
     active: bool | None = Field(default=True)
 
-    @field_validator("password", mode="before")
-    @classmethod
-    def hash_password(cls, value: str | None) -> str | None:
-        if value is None:
-            return None
-        return get_password_hash(value)
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlmodel import select
+
+from starphone_api.catalog import get_catalog_version
+from starphone_api.config import settings
+from starphone_api.db import (
+    async_engine,
+    async_session_maker,
+    replica_engine,
+    replica_session_maker,
+)
+from starphone_api.models import Product, User
+from starphone_api.routes.category import load_category_list
+from starphone_api.routes.product import (
+    _product_detail_stmt,
+    _product_record,
+    _product_response_stmt,
+)
+from starphone_api.security import get_password_hash, hash_pool
+from starphone_api.serializers.product import ProductResponse, product_page_json
+
+logger = logging.getLogger(__name__)
+
+WARMUP_PASSWORD = "warm-up"
+
+
+class Readiness:
+    """
+    Estado do aquecimento deste worker, exposto em /health/ready.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.steps: dict[str, float] = {}
+        self.error: str | None = None
+
+
+readiness = Readiness()
+
+
+def _engines() -> list[tuple[AsyncEngine, async_sessionmaker]]:
+    engines = [(async_engine, async_session_maker)]
+    if replica_engine is not None:
+        engines.append((replica_engine, replica_session_maker))
+    return engines
+
+
+async def _open_connections(count: int) -> None:
+    # Segura `count` conexões ao mesmo tempo para o pool abrir todas; ao
+    # sair elas voltam para o pool e ficam disponíveis
+    for engine, _ in _engines():
+        async with AsyncExitStack() as stack:
+            for _ in range(count):
+                await stack.enter_async_context(engine.connect())
+
+
+async def _run_hot_queries() -> None:
+    for _, session_maker in _engines():
+        await _run_hot_queries_on(session_maker)
+
+
+async def _run_hot_queries_on(session_maker: async_sessionmaker) -> None:
+    # Mesmos formatos de consulta das rotas quentes: o SQLAlchemy guarda a
+    # compilação de cada um no cache de statements do engine
+    async with session_maker() as session:
+        await session.exec(select(User).where(User.email == ""))
+        await get_catalog_version(session)
+
+        stmt = _product_response_stmt(Product.__table__).order_by(Product.id.asc()).limit(51)
+        rows = (await session.exec(stmt)).all()
+        product_page_json.dump_json(
+            {"items": [_product_record(row) for row in rows], "next_cursor": None}
+        )
+
+        if rows:
+            product = (await session.exec(_product_detail_stmt(rows[0].id))).first()
+            if product is not None:
+                ProductResponse.model_validate(product)
+
+
+async def _prime_caches() -> None:
+    async with async_session_maker() as session:
+        await load_category_list(session)
+
+
+async def _warm_password_hash() -> None:
+    # Uma chamada por thread do pool: cria as threads e carrega o argon2
+    await asyncio.gather(
+        *(hash_pool.run(get_password_hash, WARMUP_PASSWORD) for _ in range(hash_pool.max_workers))
+    )
+
+
+async def warm_up() -> Readiness:
+    """
+    Prepara o worker antes de aceitar tráfego: abre conexões do pool,
+    compila as consultas quentes, preenche os caches de leitura e aquece
+    o Argon2 (com réplica de leitura, o pool e as consultas dela também).
+    Falhas são registradas e não impedem a subida do worker;
+    as requisições apenas voltam a pagar o custo de inicialização.
+    """
+    steps = (
+        ("db_connections", lambda: _open_connections(settings.WARMUP_DB_CONNECTIONS)),
+        ("hot_queries", _run_hot_queries),
+        ("caches", _prime_caches),
+        ("password_hash", _warm_password_hash),
+    )
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            await step()
+        except Exception as exc:
+            logger.exception("Falha no aquecimento (%s)", name)
+            readiness.error = f"{name}: {exc}"
+            continue
+        readiness.steps[name] = time.perf_counter() - start
+
+    readiness.ready = True
+    logger.info(
+        "Worker pronto: %s",
+        ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in readiness.steps.items()),
+    )
+    return readiness
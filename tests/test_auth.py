@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from starphone_api.auth import (
+    create_access_token,
+    current_user_cache,
+    get_current_user,
+    invalidate_cached_user,
+)
+from starphone_api.db import async_session_maker
+from starphone_api.invalidation import cache_invalidations
+from starphone_api.models import User
+from starphone_api.query_budget import record_queries
+
+from .conftest import ADMIN_EMAIL, PASSWORD_HASH
+
+pytestmark = pytest.mark.anyio
+
+SELLER_EMAIL = "vendedor@starphone.com.br"
+
+
+@pytest.fixture
+async def seller_headers(database):
+    async with async_session_maker() as session:
+        session.add(
+            User(
+                fullname="Vendedor",
+                email=SELLER_EMAIL,
+                salary=Decimal("2000"),
+                hiring_date=datetime.now(timezone.utc),
+                password=PASSWORD_HASH,
+            )
+        )
+        await session.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': SELLER_EMAIL})}"}
+
+
+async def test_deactivated_user_is_rejected_right_away(client, seller_headers):
+    assert (await client.get("/auth/me", headers=seller_headers)).status_code == 200
+    assert SELLER_EMAIL in current_user_cache._data
+
+    response = await client.patch(f"/users/{SELLER_EMAIL}/deactivate/")
+    assert response.status_code == 200
+
+    response = await client.get("/auth/me", headers=seller_headers)
+    assert response.status_code == 403
+
+
+async def test_lookup_in_flight_during_deactivation_is_not_cached(seller_headers, monkeypatch):
+    token = seller_headers["Authorization"].removeprefix("Bearer ")
+    async with async_session_maker() as session:
+        exec_ = session.exec
+
+        async def exec_then_invalidate(*args, **kwargs):
+            result = await exec_(*args, **kwargs)
+            # A desativação chega (localmente ou por NOTIFY) com a leitura em curso
+            invalidate_cached_user(SELLER_EMAIL)
+            return result
+
+        monkeypatch.setattr(session, "exec", exec_then_invalidate)
+        user = await get_current_user(session, token)
+
+    # A leitura em curso viu a linha antiga, mas ela não fica no cache
+    assert user.is_active
+    assert SELLER_EMAIL not in current_user_cache._data
+
+
+async def test_cache_is_bypassed_while_invalidation_listener_is_down(client, monkeypatch):
+    await client.get("/auth/me")
+    assert ADMIN_EMAIL in current_user_cache._data
+
+    monkeypatch.setattr(cache_invalidations, "enabled", True)
+    monkeypatch.setattr(cache_invalidations, "listening", False)
+    with record_queries() as log:
+        assert (await client.get("/auth/me")).status_code == 200
+    assert len(log) == 1
+
+    monkeypatch.setattr(cache_invalidations, "listening", True)
+    with record_queries() as log:
+        assert (await client.get("/auth/me")).status_code == 200
+    assert len(log) == 0
+
+
+async def test_replica_read_of_recently_changed_user_is_not_cached(
+    client, seller_headers, monkeypatch
+):
+    monkeypatch.setattr("starphone_api.auth.is_replica_session", lambda session: True)
+
+    response = await client.put(
+        f"/users/{SELLER_EMAIL}/",
+        json={"fullname": "Vendedor 2", "email": SELLER_EMAIL, "salary": "2000", "admin": False},
+    )
+    assert response.status_code == 200
+
+    # Dentro da janela de read-your-writes a réplica pode devolver a versão antiga
+    assert (await client.get("/auth/me", headers=seller_headers)).status_code == 200
+    assert SELLER_EMAIL not in current_user_cache._data
+
+    # Usuários sem alteração recente continuam indo para o cache
+    assert (await client.get("/auth/me")).status_code == 200
+    assert ADMIN_EMAIL in current_user_cache._data
@@ -0,0 +1,70 @@
+import pytest
+
+from starphone_api.db import async_session_maker
+from starphone_api.invalidation import cache_invalidations
+from starphone_api.query_budget import record_queries
+from starphone_api.routes.category import (
+    CATEGORY_LIST_KEY,
+    category_cache,
+    invalidate_category_cache,
+    load_category_list,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_write_invalidates_cached_category_list(client):
+    assert [c["name"] for c in (await client.get("/categories/")).json()] == ["Smartphones", "Capas"]
+    assert CATEGORY_LIST_KEY in category_cache._data
+
+    assert (await client.put("/categories/2/", json={"name": "Películas"})).status_code == 200
+    assert CATEGORY_LIST_KEY not in category_cache._data
+    assert [c["name"] for c in (await client.get("/categories/")).json()] == ["Smartphones", "Películas"]
+
+
+async def test_list_read_in_flight_during_write_is_not_cached(database, monkeypatch):
+    async with async_session_maker() as session:
+        exec_ = session.exec
+
+        async def exec_then_invalidate(*args, **kwargs):
+            result = await exec_(*args, **kwargs)
+            # A escrita chega (localmente ou por NOTIFY) com a leitura em curso
+            invalidate_category_cache()
+            return result
+
+        monkeypatch.setattr(session, "exec", exec_then_invalidate)
+        await load_category_list(session)
+
+    assert CATEGORY_LIST_KEY not in category_cache._data
+
+
+async def test_cache_is_bypassed_while_invalidation_listener_is_down(client, monkeypatch):
+    await client.get("/categories/1/")
+    assert 1 in category_cache._data
+
+    monkeypatch.setattr(cache_invalidations, "enabled", True)
+    monkeypatch.setattr(cache_invalidations, "listening", False)
+    with record_queries() as log:
+        assert (await client.get("/categories/1/")).status_code == 200
+    # Usuário e categoria vêm do banco
+    assert len(log) == 2
+
+    monkeypatch.setattr(cache_invalidations, "listening", True)
+    with record_queries() as log:
+        assert (await client.get("/categories/1/")).status_code == 200
+    assert len(log) == 0
+
+
+async def test_replica_read_after_category_write_is_not_cached(client, monkeypatch):
+    monkeypatch.setattr("starphone_api.routes.category.is_replica_session", lambda session: True)
+
+    # Sem escrita recente a leitura na réplica vai para o cache normalmente
+    assert (await client.get("/categories/1/")).status_code == 200
+    assert 1 in category_cache._data
+
+    assert (await client.put("/categories/2/", json={"name": "Películas"})).status_code == 200
+
+    # Dentro da janela de read-your-writes a réplica pode devolver a versão antiga
+    assert (await client.get("/categories/")).status_code == 200
+    assert (await client.get("/categories/2/")).status_code == 200
+    assert category_cache._data == {}
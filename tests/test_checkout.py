@@ -0,0 +1,82 @@
+import anyio
+import pytest
+from sqlmodel import func, select
+
+from starphone_api.db import async_session_maker
+from starphone_api.models import Product, Sale, SaleItem
+from starphone_api.query_budget import record_queries
+
+from .conftest import requires_postgresql
+
+pytestmark = [pytest.mark.anyio, requires_postgresql]
+
+
+async def stock(*product_ids: int) -> dict[int, int]:
+    async with async_session_maker() as session:
+        rows = await session.exec(select(Product.id, Product.quantity).where(Product.id.in_(product_ids)))
+        return dict(rows.all())
+
+
+async def sale_count() -> tuple[int, int]:
+    async with async_session_maker() as session:
+        sales = (await session.exec(select(func.count()).select_from(Sale))).one()
+        items = (await session.exec(select(func.count()).select_from(SaleItem))).one()
+        return sales, items
+
+
+async def test_checkout(client):
+    cart = {"items": [{"product_id": 3, "quantity": 2}, {"product_id": 1, "quantity": 1}, {"product_id": 3, "quantity": 1}]}
+    response = await client.post("/sales/checkout/", json=cart)
+    assert response.status_code == 200
+    body = response.json()
+    assert [(item["product_id"], item["quantity"]) for item in body["items"]] == [(1, 1), (3, 3)]
+    assert body["total"] == "480.00"
+    assert await stock(1, 3) == {1: 9, 3: 7}
+    assert await sale_count() == (1, 2)
+
+
+async def test_checkout_locks_products_in_id_order(client):
+    cart = {"items": [{"product_id": 5, "quantity": 1}, {"product_id": 2, "quantity": 1}, {"product_id": 4, "quantity": 1}]}
+    with record_queries() as log:
+        assert (await client.post("/sales/checkout/", json=cart)).status_code == 200
+    lock = next(statement for statement in log.statements if "FOR UPDATE" in statement)
+    assert "ORDER BY product.id" in lock
+
+
+async def test_overlapping_checkouts_do_not_deadlock(client):
+    # Carrinhos com os mesmos produtos em ordens opostas, todos ao mesmo tempo
+    carts = [
+        [{"product_id": 1, "quantity": 1}, {"product_id": 2, "quantity": 1}],
+        [{"product_id": 2, "quantity": 1}, {"product_id": 1, "quantity": 1}],
+    ] * 4
+    statuses = []
+
+    async def checkout(items):
+        statuses.append((await client.post("/sales/checkout/", json={"items": items})).status_code)
+
+    async with anyio.create_task_group() as tg:
+        for items in carts:
+            tg.start_soon(checkout, items)
+
+    assert statuses == [200] * len(carts)
+    assert await stock(1, 2) == {1: 2, 2: 2}
+
+
+async def test_checkout_with_insufficient_stock_rolls_back(client):
+    cart = {"items": [{"product_id": 1, "quantity": 2}, {"product_id": 2, "quantity": 6}, {"product_id": 2, "quantity": 5}]}
+    response = await client.post("/sales/checkout/", json=cart)
+    assert response.status_code == 409
+    assert response.json()["detail"] == {"message": "Estoque insuficiente", "product_ids": [2]}
+
+    # Nada foi baixado nem registrado, nem mesmo o item com estoque suficiente
+    assert await stock(1, 2) == {1: 10, 2: 10}
+    assert await sale_count() == (0, 0)
+
+
+async def test_checkout_with_missing_product(client):
+    cart = {"items": [{"product_id": 1, "quantity": 1}, {"product_id": 999, "quantity": 1}]}
+    response = await client.post("/sales/checkout/", json=cart)
+    assert response.status_code == 404
+    assert response.json()["detail"] == {"message": "Produto não encontrado", "product_ids": [999]}
+    assert await stock(1) == {1: 10}
+    assert await sale_count() == (0, 0)
@@ -0,0 +1,99 @@
+import pytest
+
+from starphone_api.query_budget import record_queries
+
+from .conftest import requires_postgresql
+
+pytestmark = pytest.mark.anyio
+
+PRODUCT = {
+    "name": "Capa Galaxy S24",
+    "category_id": 1,
+    "quantity": 3,
+    "cost_value": "25.00",
+    "profit_value": "15.00",
+}
+
+
+@pytest.mark.parametrize("path", ["/products/", "/products/1/", "/products/batch?ids=1&ids=2"])
+async def test_product_reads_answer_304_while_catalog_is_unchanged(client, path):
+    first = await client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    # Só a versão do catálogo é consultada (o usuário já está em cache)
+    with record_queries() as log:
+        response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert len(log) == 1
+
+    # Comparação fraca: a forma sem W/ e listas de ETags também valem
+    response = await client.get(path, headers={"If-None-Match": f'"outro", {etag.removeprefix("W/")}'})
+    assert response.status_code == 304
+
+
+@requires_postgresql
+async def test_product_write_changes_the_etag(client):
+    etag = (await client.get("/products/1/")).headers["ETag"]
+
+    assert (await client.put("/products/2/", json=PRODUCT)).status_code == 200
+
+    response = await client.get("/products/1/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["id"] == 1
+
+
+async def test_category_write_changes_the_product_etag(client):
+    # O nome da categoria faz parte da resposta dos produtos
+    etag = (await client.get("/products/1/")).headers["ETag"]
+
+    assert (await client.put("/categories/2/", json={"name": "Películas"})).status_code == 200
+
+    response = await client.get("/products/1/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["category"] == {"id": 2, "name": "Películas"}
+
+
+async def test_category_etag_follows_its_content(client):
+    first = await client.get("/categories/2/")
+    etag = first.headers["ETag"]
+    response = await client.get("/categories/2/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    # Escrita em outra categoria não muda o conteúdo (nem o ETag) desta
+    assert (await client.put("/categories/1/", json={"name": "Celulares"})).status_code == 200
+    assert (await client.get("/categories/2/", headers={"If-None-Match": etag})).status_code == 304
+
+    assert (await client.put("/categories/2/", json={"name": "Películas"})).status_code == 200
+    response = await client.get("/categories/2/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json() == {"id": 2, "name": "Películas"}
+
+
+async def test_category_list_etag_changes_after_create(client):
+    etag = (await client.get("/categories/")).headers["ETag"]
+    assert (await client.get("/categories/", headers={"If-None-Match": etag})).status_code == 304
+
+    assert (await client.post("/categories/", json={"name": "Fones"})).status_code == 200
+    response = await client.get("/categories/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [c["name"] for c in response.json()] == ["Smartphones", "Capas", "Fones"]
+
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip", "br"])
+async def test_etag_is_the_same_with_or_without_compression(client, encoding):
+    response = await client.get("/products/", headers={"Accept-Encoding": encoding})
+    assert response.headers.get("Content-Encoding", "identity") == encoding
+    etag = response.headers["ETag"]
+    assert etag == 'W/"catalog-1"'
+
+    response = await client.get("/products/", headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+import pytest
+from sqlmodel import select
+
+from starphone_api.db import async_session_maker
+from starphone_api.inventory import compact_inventory_deltas
+from starphone_api.models import InventoryDelta, InventorySummary
+
+from .conftest import requires_postgresql
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def inventory(database):
+    """
+    Resumo compactado das duas categorias mais variações pendentes (como as
+    gravadas pelos triggers): um produto novo em Smartphones e a saída do
+    último produto de Capas.
+    """
+    async with async_session_maker() as session:
+        session.add(InventorySummary(category_id=1, product_count=2, total_units=20, total_cost=Decimal("2000"), total_profit=Decimal("400")))
+        session.add(InventorySummary(category_id=2, product_count=1, total_units=10, total_cost=Decimal("1000"), total_profit=Decimal("200")))
+        session.add(InventoryDelta(category_id=1, product_count=1, total_units=5, total_cost=Decimal("500"), total_profit=Decimal("100")))
+        session.add(InventoryDelta(category_id=1, product_count=0, total_units=-2, total_cost=Decimal("-200"), total_profit=Decimal("-40")))
+        session.add(InventoryDelta(category_id=2, product_count=-1, total_units=-10, total_cost=Decimal("-1000"), total_profit=Decimal("-200")))
+        await session.commit()
+
+
+async def test_valuation_includes_pending_deltas(client, inventory):
+    response = await client.get("/inventory/valuation")
+    assert response.status_code == 200
+    body = response.json()
+    # Capas ficou sem produtos e sai da listagem
+    assert [(c["category_id"], c["product_count"], c["total_units"]) for c in body["categories"]] == [(1, 3, 23)]
+    assert Decimal(body["total_cost"]) == Decimal("2300")
+    assert Decimal(body["total_profit"]) == Decimal("460")
+
+
+@requires_postgresql
+async def test_compaction_folds_deltas_into_summary(client, inventory):
+    before = (await client.get("/inventory/valuation")).json()
+
+    async with async_session_maker() as session:
+        assert await compact_inventory_deltas(session) == 2
+    async with async_session_maker() as session:
+        assert (await session.exec(select(InventoryDelta))).all() == []
+        summary = {row.category_id: row.product_count for row in (await session.exec(select(InventorySummary))).all()}
+    assert summary == {1: 3, 2: 0}
+
+    assert (await client.get("/inventory/valuation")).json() == before
@@ -0,0 +1,104 @@
+import pytest
+
+from starphone_api import auth
+from starphone_api.login_admission import LoginAdmission, MemoryTokenBucketBackend
+from starphone_api.query_budget import record_queries
+
+from .conftest import ADMIN_EMAIL
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_bucket_refills_over_time():
+    clock = FakeClock()
+    backend = MemoryTokenBucketBackend(timer=clock)
+    assert [await backend.consume("k", 2, 0.5) for _ in range(2)] == [0, 0]
+    assert await backend.consume("k", 2, 0.5) == pytest.approx(2.0)
+
+    clock.now = 2.0
+    assert await backend.consume("k", 2, 0.5) == 0
+    assert await backend.consume("k", 2, 0.5) > 0
+
+
+async def test_least_recently_used_keys_are_dropped():
+    backend = MemoryTokenBucketBackend(max_keys=2, timer=FakeClock())
+    await backend.consume("a", 1, 1)
+    await backend.consume("b", 1, 1)
+    await backend.consume("c", 1, 1)
+    # "a" foi descartada: volta com o bucket cheio
+    assert await backend.consume("a", 1, 1) == 0
+    assert await backend.consume("c", 1, 1) > 0
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    """
+    Controle de admissão com limites pequenos e relógio parado.
+    """
+    admission = LoginAdmission(
+        backend=MemoryTokenBucketBackend(timer=FakeClock()),
+        account_capacity=2,
+        account_per_minute=1,
+        ip_capacity=4,
+        ip_per_minute=1,
+    )
+    monkeypatch.setattr("starphone_api.routes.auth.login_admission", admission)
+    return admission
+
+
+@pytest.fixture
+def argon2_calls(monkeypatch) -> list[str]:
+    calls = []
+    verify = auth.verify_password_async
+
+    async def counting_verify(password, password_hash):
+        calls.append(password)
+        return await verify(password, password_hash)
+
+    monkeypatch.setattr(auth, "verify_password_async", counting_verify)
+    return calls
+
+
+async def login(client, password: str, email: str = ADMIN_EMAIL):
+    return await client.post("/auth/login", data={"username": email, "password": password})
+
+
+async def test_rejected_before_database_and_argon2(client, admission, argon2_calls):
+    for _ in range(2):
+        assert (await login(client, "errada")).status_code == 401
+    assert len(argon2_calls) == 2
+
+    with record_queries() as log:
+        response = await login(client, "errada")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert len(log) == 0
+    assert len(argon2_calls) == 2
+    assert admission.stats() == {"admitted": 2, "rejected_ip": 0, "rejected_account": 1}
+
+
+async def test_successful_login_resets_the_account_bucket(client, admission):
+    assert (await login(client, "errada")).status_code == 401
+    assert (await login(client, "admin123")).status_code == 200
+
+    # O bucket da conta voltou cheio: dois erros de digitação cabem de novo
+    assert (await login(client, "errada")).status_code == 401
+    assert (await login(client, "errada")).status_code == 401
+    assert (await login(client, "errada")).status_code == 429
+
+
+async def test_ip_bucket_limits_attempts_across_accounts(client, admission):
+    for i in range(4):
+        assert (await login(client, "errada", f"conta{i}@starphone.com.br")).status_code == 401
+
+    response = await login(client, "errada", "outra@starphone.com.br")
+    assert response.status_code == 429
+    assert admission.stats()["rejected_ip"] == 1
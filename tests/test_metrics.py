@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from starphone_api.metrics import MetricsMiddleware, request_duration
+
+pytestmark = pytest.mark.anyio
+
+
+def make_router() -> APIRouter:
+    router = APIRouter()
+
+    @router.get("/")
+    async def list_items():
+        return []
+
+    @router.get("/{item_id}/")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    return router
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(make_router(), prefix="/products")
+    app.include_router(make_router(), prefix="/categories")
+
+    # Prefixo vindo do ponto de montagem (root_path), fora do template da rota
+    legacy = FastAPI()
+    legacy.include_router(make_router(), prefix="/products")
+    app.mount("/v1", legacy)
+    return app
+
+
+def route_labels() -> set[str]:
+    return {
+        sample.labels["route"]
+        for metric in request_duration.collect()
+        for sample in metric.samples
+        if sample.labels.get("method") == "GET"
+    }
+
+
+async def test_route_label_keeps_router_and_mount_prefixes():
+    transport = httpx.ASGITransport(app=make_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for path in ("/products/", "/products/1/", "/categories/", "/categories/2/", "/v1/products/3/"):
+            assert (await client.get(path)).status_code == 200
+        assert (await client.get("/missing/")).status_code == 404
+
+    labels = route_labels()
+    assert {
+        "/products/",
+        "/products/{item_id}/",
+        "/categories/",
+        "/categories/{item_id}/",
+        "/v1/products/{item_id}/",
+        "unmatched",
+    } <= labels
+    assert "/" not in labels
+    assert "/{item_id}/" not in labels
+
+
+def run_worker(code: str, multiproc_dir) -> str:
+    env = {
+        **os.environ,
+        "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir),
+        "PYTHONPATH": os.pathsep.join(sys.path),
+    }
+    script = f"from starphone_api import metrics\n{code}"
+    return subprocess.run(
+        [sys.executable, "-c", script], env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def test_multiprocess_mode_sums_all_workers(tmp_path):
+    for _ in range(2):
+        run_worker('metrics.login_admission.labels("admitted").inc()', tmp_path)
+
+    output = run_worker("print(metrics.render_metrics().decode())", tmp_path)
+    assert 'starphone_login_admission_total{result="admitted"} 2.0' in output
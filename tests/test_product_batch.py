@@ -0,0 +1,35 @@
+import pytest
+
+from starphone_api.routes.product import MAX_BATCH_IDS
+
+pytestmark = pytest.mark.anyio
+
+
+async def get_batch(client, *ids: int):
+    response = await client.get("/products/batch", params={"ids": list(ids)})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_batch_keeps_requested_order_and_reports_missing_ids(client):
+    body = await get_batch(client, 4, 99, 2, 4, 77, 5)
+    assert [item["id"] for item in body["items"]] == [4, 2, 5]
+    assert body["missing_ids"] == [99, 77]
+    assert body["items"][0]["category"] == {"id": 1, "name": "Smartphones"}
+    assert body["items"][0]["created_by"]["email"] == "admin@starphone.com.br"
+
+
+async def test_batch_with_only_missing_ids(client):
+    assert await get_batch(client, 98, 99) == {"items": [], "missing_ids": [98, 99]}
+
+
+async def test_deleted_product_is_reported_missing(client):
+    assert (await client.delete("/products/3/")).status_code == 200
+    body = await get_batch(client, 1, 3)
+    assert [item["id"] for item in body["items"]] == [1]
+    assert body["missing_ids"] == [3]
+
+
+@pytest.mark.parametrize("params", [{}, {"ids": ["x"]}, {"ids": list(range(1, MAX_BATCH_IDS + 2))}])
+async def test_invalid_batch_is_rejected(client, params):
+    assert (await client.get("/products/batch", params=params)).status_code == 422
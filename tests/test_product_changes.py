@@ -0,0 +1,135 @@
+import pytest
+
+from .conftest import ADMIN_EMAIL
+
+pytestmark = pytest.mark.anyio
+
+
+async def sync(client, since, limit=2):
+    """
+    Percorre todas as páginas de /products/changes e junta as respostas.
+    """
+    pages = []
+    params = {"since": since, "limit": limit}
+    while True:
+        response = await client.get("/products/changes", params=params)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        if pages[-1]["next_cursor"] is None:
+            return pages
+        params = {**params, "cursor": pages[-1]["next_cursor"]}
+
+
+async def current_seq(client):
+    return (await sync(client, 0, limit=200))[0]["seq"]
+
+
+async def test_full_sync_pages_through_every_product(client):
+    pages = await sync(client, 0)
+
+    assert [len(page["products"]) for page in pages] == [2, 2, 1]
+    assert [p["id"] for page in pages for p in page["products"]] == [1, 2, 3, 4, 5]
+    assert {page["seq"] for page in pages} == {1}
+    # Categorias e exclusões só na primeira página
+    assert [c["name"] for c in pages[0]["categories"]] == ["Smartphones", "Capas"]
+    assert all(page["categories"] == [] for page in pages[1:])
+
+
+async def test_sync_at_current_version_is_empty(client):
+    (page,) = await sync(client, 1)
+    assert page == {
+        "seq": 1,
+        "products": [],
+        "deleted_product_ids": [],
+        "categories": [],
+        "deleted_category_ids": [],
+        "users": [],
+        "next_cursor": None,
+    }
+
+
+async def test_since_ahead_of_catalog_is_a_conflict(client):
+    response = await client.get("/products/changes", params={"since": 2})
+    assert response.status_code == 409
+
+
+async def test_cursor_from_another_sync_is_rejected(client):
+    (first, *_) = await sync(client, 0)
+    response = await client.get(
+        "/products/changes", params={"since": 1, "cursor": first["next_cursor"]}
+    )
+    assert response.status_code == 400
+
+
+async def test_deletes_are_returned_as_tombstones(client):
+    response = await client.post("/categories/", json={"name": "Fones"})
+    assert response.status_code == 200
+    category_id = response.json()["id"]
+    since = await current_seq(client)
+
+    assert (await client.delete(f"/categories/{category_id}/")).status_code == 200
+    assert (await client.delete("/products/5/")).status_code == 200
+
+    (page,) = await sync(client, since)
+    assert page["seq"] == since + 2
+    assert page["deleted_category_ids"] == [category_id]
+    assert page["deleted_product_ids"] == [5]
+    assert page["products"] == []
+    assert page["categories"] == []
+
+
+async def test_category_rename_restamps_its_products(client):
+    response = await client.put("/categories/1/", json={"name": "Celulares"})
+    assert response.status_code == 200
+
+    (page,) = await sync(client, 1)
+    assert page["seq"] == 2
+    assert page["categories"] == [{"id": 1, "name": "Celulares"}]
+    assert [p["id"] for p in page["products"]] == [2, 4]
+    assert {p["category"]["name"] for p in page["products"]} == {"Celulares"}
+
+
+async def test_user_rename_is_its_own_entry(client):
+    response = await client.put(
+        f"/users/{ADMIN_EMAIL}/",
+        json={"fullname": "Gerente", "email": ADMIN_EMAIL, "salary": "1000", "admin": True},
+    )
+    assert response.status_code == 200
+
+    # Os produtos do usuário não são regravados: o terminal aplica a
+    # alteração aos created_by/updated_by com o mesmo id
+    (page,) = await sync(client, 1)
+    assert page["seq"] == 2
+    assert page["users"] == [{"id": 1, "name": "Gerente", "email": ADMIN_EMAIL}]
+    assert page["products"] == []
+
+    (first, *_) = await sync(client, 0)
+    assert first["products"][0]["created_by"] == {"id": 1, "name": "Gerente", "email": ADMIN_EMAIL}
+
+
+async def test_user_edit_without_name_or_email_change_keeps_the_version(client):
+    response = await client.put(
+        f"/users/{ADMIN_EMAIL}/",
+        json={"fullname": "Admin", "email": ADMIN_EMAIL, "salary": "9999", "admin": True},
+    )
+    assert response.status_code == 200
+    assert await current_seq(client) == 1
+
+
+async def test_write_during_sync_is_left_for_the_next_one(client):
+    first = (await client.get("/products/changes", params={"since": 0, "limit": 2})).json()
+    assert [p["id"] for p in first["products"]] == [1, 2]
+
+    # Renomeia a categoria dos produtos 2 e 4 no meio da sincronização
+    assert (await client.put("/categories/1/", json={"name": "Celulares"})).status_code == 200
+
+    params = {"since": 0, "limit": 2, "cursor": first["next_cursor"]}
+    rest = (await client.get("/products/changes", params=params)).json()
+    while rest["next_cursor"] is not None:
+        params["cursor"] = rest["next_cursor"]
+        rest["products"] += (await client.get("/products/changes", params=params)).json()["products"]
+    assert rest["seq"] == 1
+    assert [p["id"] for p in rest["products"]] == [3, 5]
+
+    (page,) = await sync(client, rest["seq"])
+    assert [p["id"] for p in page["products"]] == [2, 4]
@@ -0,0 +1,78 @@
+import pytest
+
+from starphone_api.product_import import _ends_inside_quotes, iter_lines, iter_records
+
+pytestmark = pytest.mark.anyio
+
+CSV = (
+    'name,category_id,quantity,cost_value,profit_value\n'
+    '"Capa ""Clear""\nGalaxy S24",1,2,10,5\n'
+    'Película,1,3,4,2\n'
+    '\n'
+    'Tela 6.5",1,1,100,50\n'
+    '"Cabo\n\nUSB-C",2,5,8,4\n'
+).encode()
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def read_records(data: bytes, size: int) -> list:
+    return [row async for row in iter_records(iter_lines(chunked(data, size)), "csv")]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 4096])
+async def test_csv_quoted_newlines_across_chunks(size):
+    records = await read_records(CSV, size)
+    assert [(line, record["name"]) for line, record, _ in records] == [
+        (2, 'Capa "Clear"\nGalaxy S24'),
+        (4, "Película"),
+        (6, 'Tela 6.5"'),
+        (7, "Cabo\n\nUSB-C"),
+    ]
+    assert all(error is None for _, _, error in records)
+
+
+@pytest.mark.parametrize(
+    "line, in_quotes, expected",
+    [
+        ("a,b,c", False, False),
+        ('"aberto,b', False, True),
+        ('"fechado",b', False, False),
+        ('a,"b ""c"" d', False, True),
+        ('Tela 6.5",1', False, False),
+        ('a, "b', False, False),
+        ("continua", True, True),
+        ('fim",2', True, False),
+        ('fim"",2', True, True),
+        ('fim","novo', True, True),
+    ],
+)
+def test_quote_state_across_lines(line, in_quotes, expected):
+    assert _ends_inside_quotes(line, in_quotes) is expected
+
+
+async def test_csv_field_spanning_many_lines():
+    name = "\n".join(f"linha {i}" for i in range(5000))
+    data = f'name,quantity\n"{name}",1\nok,2\n'.encode()
+    records = await read_records(data, 4096)
+    assert records == [
+        (2, {"name": name, "quantity": "1"}, None),
+        (5002, {"name": "ok", "quantity": "2"}, None),
+    ]
+
+
+async def test_csv_unterminated_quote_is_reported():
+    records = await read_records(b'name,quantity\nok,1\n"sem fim,2\noutra,3\n', 5)
+    assert records[0] == (2, {"name": "ok", "quantity": "1"}, None)
+    assert records[1] == (3, None, "Campo entre aspas sem fechamento")
+
+
+async def test_import_csv_with_multiline_name(client):
+    body = b'name,category_id,quantity,cost_value,profit_value\n"Capa\nDupla",1,2,10,5\n'
+    response = await client.post("/products/import", content=body)
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 1
+    assert response.json()["failed"] == 0
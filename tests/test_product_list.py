@@ -0,0 +1,64 @@
+import pytest
+from fastapi import HTTPException
+
+from starphone_api.pagination import decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+
+async def list_all(client, **params):
+    """
+    Percorre todas as páginas de GET /products/ e retorna os ids na ordem.
+    """
+    ids = []
+    params = {"limit": 2, **params}
+    while True:
+        response = await client.get("/products/", params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        ids += [item["id"] for item in page["items"]]
+        if page["next_cursor"] is None:
+            return ids
+        params["cursor"] = page["next_cursor"]
+
+
+def test_cursor_round_trip():
+    data = {"sort": "name", "order": "asc", "key": "Capa ção", "id": 7}
+    cursor = encode_cursor(data)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == data
+
+
+@pytest.mark.parametrize("cursor", ["@@@", encode_cursor({}) + "x", "WzEsMl0"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+async def test_pages_follow_id_order(client):
+    assert await list_all(client) == [1, 2, 3, 4, 5]
+    assert await list_all(client, order="desc") == [5, 4, 3, 2, 1]
+
+
+async def test_ties_on_the_sort_key_are_broken_by_id(client):
+    # Todos os produtos semeados têm a mesma quantidade
+    assert await list_all(client, sort="quantity") == [1, 2, 3, 4, 5]
+    assert await list_all(client, sort="quantity", order="desc") == [5, 4, 3, 2, 1]
+
+
+async def test_filters_apply_to_every_page(client):
+    assert await list_all(client, category_id=2, sort="name") == [1, 3, 5]
+
+
+async def test_invalid_cursor_is_a_bad_request(client):
+    response = await client.get("/products/", params={"cursor": "@@@"})
+    assert response.status_code == 400
+
+
+async def test_cursor_from_another_sort_is_rejected(client):
+    first = (await client.get("/products/", params={"limit": 2, "sort": "quantity"})).json()
+    response = await client.get(
+        "/products/", params={"limit": 2, "sort": "name", "cursor": first["next_cursor"]}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,36 @@
+import pytest
+
+from starphone_api.routes.product import _case_variants
+
+from .conftest import requires_postgresql
+
+pytestmark = pytest.mark.anyio
+
+
+async def search(client, q, **params):
+    response = await client.get("/products/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return [product["name"] for product in response.json()]
+
+
+def test_case_variants():
+    assert _case_variants("ca") == ["CA", "Ca", "cA", "ca"]
+    assert _case_variants("4g") == ["4G", "4g"]
+
+
+@pytest.mark.parametrize("q", ["p", "P", "pr", "PR", " pR "])
+async def test_short_term_matches_prefix_in_any_case(client, q):
+    assert await search(client, q) == [f"Produto {i}" for i in range(1, 6)]
+
+
+async def test_short_term_does_not_match_inside_the_name(client):
+    assert await search(client, "ro") == []
+
+
+async def test_short_term_respects_limit(client):
+    assert await search(client, "pr", limit=2) == ["Produto 1", "Produto 2"]
+
+
+@requires_postgresql
+async def test_long_term_uses_similarity(client):
+    assert await search(client, "duto 3")[0] == "Produto 3"
@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from starphone_api.auth import get_current_user
+from starphone_api.db import async_session_maker
+from starphone_api.main import app
+from starphone_api.models import Sale, SaleItem, User
+
+from .conftest import ADMIN_EMAIL, requires_postgresql
+
+pytestmark = pytest.mark.anyio
+
+PRODUCT = {
+    "name": "Capa Galaxy S24",
+    "category_id": 1,
+    "quantity": 3,
+    "cost_value": "25.00",
+    "profit_value": "15.00",
+}
+
+
+@pytest.fixture
+async def authenticated(database):
+    """
+    Usuário já resolvido (como num acerto do cache), para que o orçamento
+    conte só os comandos da própria escrita.
+    """
+    async with async_session_maker() as session:
+        admin = (await session.exec(select(User).where(User.email == ADMIN_EMAIL))).one()
+    app.dependency_overrides[get_current_user] = lambda: admin
+    yield admin
+    app.dependency_overrides.pop(get_current_user)
+
+
+@requires_postgresql
+async def test_create_product_in_two_statements(client, authenticated, query_budget):
+    # INSERT ... RETURNING com a projeção da resposta + versão do catálogo
+    with query_budget(2):
+        response = await client.post("/products/", json=PRODUCT)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["name"] == PRODUCT["name"]
+    assert body["category"] == {"id": 1, "name": "Smartphones"}
+    assert body["created_by"] == {"id": 1, "name": "Admin", "email": ADMIN_EMAIL}
+
+
+@requires_postgresql
+async def test_update_product_in_two_statements(client, authenticated, query_budget):
+    with query_budget(2):
+        response = await client.put("/products/1/", json={**PRODUCT, "category_id": 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["id"] == 1
+    assert body["category"] == {"id": 2, "name": "Capas"}
+    assert body["updated_by"] == {"id": 1, "name": "Admin", "email": ADMIN_EMAIL}
+
+
+@requires_postgresql
+async def test_create_product_with_missing_category(client, authenticated, query_budget):
+    with query_budget(2):
+        response = await client.post("/products/", json={**PRODUCT, "category_id": 999})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Categoria não encontrada"
+
+
+@requires_postgresql
+async def test_update_product_with_missing_category(client, authenticated, query_budget):
+    with query_budget(2):
+        response = await client.put("/products/1/", json={**PRODUCT, "category_id": 999})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Categoria não encontrada"
+
+
+@requires_postgresql
+async def test_update_missing_product(client, authenticated, query_budget):
+    with query_budget(2):
+        response = await client.put("/products/999/", json=PRODUCT)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Produto não encontrado"
+
+
+@requires_postgresql
+async def test_delete_product_with_sales(client, authenticated):
+    async with async_session_maker() as session:
+        sale = Sale(created_at=datetime.now(timezone.utc), created_by=authenticated.id, total=Decimal("120"))
+        session.add(sale)
+        await session.flush()
+        session.add(
+            SaleItem(
+                sale_id=sale.id,
+                product_id=1,
+                quantity=1,
+                unit_cost=Decimal("100"),
+                unit_price=Decimal("120"),
+            )
+        )
+        await session.commit()
+
+    response = await client.delete("/products/1/")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Não é possível excluir produto com vendas registradas."
+
+
+async def test_unrelated_integrity_error_is_not_a_client_error(client, monkeypatch):
+    async def failing_bump(session, *stamp, tombstones=()):
+        raise IntegrityError("INSERT INTO catalog_tombstone ...", {}, Exception("duplicate key"))
+
+    monkeypatch.setattr("starphone_api.routes.product.bump_catalog_version", failing_bump)
+    with pytest.raises(IntegrityError):
+        await client.delete("/products/5/")
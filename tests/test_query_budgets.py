@@ -0,0 +1,75 @@
+"""
+Confere o orçamento de comandos SQL declarado com `@query_budget` em cada
+rota: uma requisição por rota, com o cache do usuário vazio (pior caso),
+sob a fixture `route_query_budgets` do plugin.
+"""
+import pytest
+from fastapi.routing import APIRoute
+
+from starphone_api.main import app
+
+from .conftest import requires_postgresql
+
+pytestmark = pytest.mark.anyio
+
+PRODUCT = {
+    "name": "Carregador 20W",
+    "category_id": 1,
+    "quantity": 4,
+    "cost_value": "30.00",
+    "profit_value": "20.00",
+}
+
+
+def budgeted(method, template, path, pg_only=False, **request):
+    marks = [requires_postgresql] if pg_only else []
+    return pytest.param(method, template, path, request, marks=marks, id=f"{method} {template}")
+
+
+BUDGETED_REQUESTS = [
+    budgeted("POST", "/products/", "/products/", pg_only=True, json=PRODUCT),
+    budgeted("GET", "/products/", "/products/", params={"limit": 2, "category_id": 1}),
+    budgeted("GET", "/products/batch", "/products/batch", params={"ids": [1, 2, 99]}),
+    budgeted("GET", "/products/changes", "/products/changes", params={"since": 0}),
+    budgeted("GET", "/products/search", "/products/search", pg_only=True, params={"q": "Produto"}),
+    budgeted("GET", "/products/{product_id}/", "/products/1/"),
+    budgeted("PUT", "/products/{product_id}/", "/products/1/", pg_only=True, json=PRODUCT),
+    budgeted(
+        "POST",
+        "/products/stock/",
+        "/products/stock/",
+        pg_only=True,
+        json={"items": [{"product_id": 2, "delta": -1}, {"product_id": 1, "delta": 3}]},
+    ),
+    budgeted("POST", "/products/{product_id}/stock/", "/products/1/stock/", pg_only=True, json={"delta": -2}),
+    budgeted("DELETE", "/products/{product_id}/", "/products/5/", pg_only=True),
+    budgeted(
+        "POST",
+        "/sales/checkout/",
+        "/sales/checkout/",
+        pg_only=True,
+        json={"items": [{"product_id": 3, "quantity": 1}, {"product_id": 1, "quantity": 2}]},
+    ),
+    budgeted("GET", "/categories/", "/categories/"),
+    budgeted("GET", "/categories/stats", "/categories/stats"),
+    budgeted("GET", "/categories/{category_id}/", "/categories/1/"),
+]
+
+
+def test_every_budgeted_route_is_exercised():
+    declared = {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute) and hasattr(route.endpoint, "query_budget")
+        for method in route.methods
+    }
+    exercised = {(param.values[0], param.values[1]) for param in BUDGETED_REQUESTS}
+    assert declared == exercised
+
+
+@pytest.mark.parametrize("method, template, path, request_kwargs", BUDGETED_REQUESTS)
+async def test_route_stays_within_query_budget(
+    client, route_query_budgets, method, template, path, request_kwargs
+):
+    response = await client.request(method, path, **request_kwargs)
+    assert response.status_code < 400, response.text
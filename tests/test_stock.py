@@ -0,0 +1,94 @@
+import pytest
+from sqlmodel import select
+
+from starphone_api.db import async_session_maker
+from starphone_api.models import Product
+from starphone_api.serializers.product import MAX_STOCK_DELTA
+
+from .conftest import requires_postgresql
+
+pytestmark = pytest.mark.anyio
+
+
+async def stock(*product_ids: int) -> dict[int, int]:
+    async with async_session_maker() as session:
+        rows = await session.exec(select(Product.id, Product.quantity).where(Product.id.in_(product_ids)))
+        return dict(rows.all())
+
+
+@pytest.mark.parametrize("delta", [0, MAX_STOCK_DELTA + 1, -MAX_STOCK_DELTA - 1, 2**31])
+async def test_out_of_range_delta_is_rejected(client, delta):
+    response = await client.post("/products/1/stock/", json={"delta": delta})
+    assert response.status_code == 422
+
+    response = await client.post("/products/stock/", json={"items": [{"product_id": 1, "delta": delta}]})
+    assert response.status_code == 422
+    assert await stock(1) == {1: 10}
+
+
+@requires_postgresql
+async def test_adjust_stock(client):
+    response = await client.post("/products/1/stock/", json={"delta": -4})
+    assert response.status_code == 200
+    assert response.json()["quantity"] == 6
+
+    response = await client.post("/products/1/stock/", json={"delta": 2})
+    assert response.json()["quantity"] == 8
+
+
+@requires_postgresql
+async def test_adjust_stock_below_zero_is_rejected(client):
+    response = await client.post("/products/1/stock/", json={"delta": -11})
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Estoque insuficiente"
+    assert await stock(1) == {1: 10}
+
+
+@requires_postgresql
+async def test_adjust_stock_of_missing_product(client):
+    response = await client.post("/products/999/stock/", json={"delta": 1})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Produto não encontrado"
+
+
+@requires_postgresql
+async def test_adjust_stock_batch_sums_repeated_products(client):
+    items = [
+        {"product_id": 2, "delta": -3},
+        {"product_id": 1, "delta": 5},
+        {"product_id": 2, "delta": -4},
+    ]
+    response = await client.post("/products/stock/", json={"items": items})
+    assert response.status_code == 200
+    assert sorted((row["product_id"], row["quantity"]) for row in response.json()) == [(1, 15), (2, 3)]
+
+
+@requires_postgresql
+async def test_adjust_stock_batch_below_zero_applies_nothing(client):
+    # Cada linha cabe no estoque, mas a soma das duas deixa o produto 2 negativo
+    items = [
+        {"product_id": 1, "delta": -1},
+        {"product_id": 2, "delta": -6},
+        {"product_id": 2, "delta": -6},
+    ]
+    response = await client.post("/products/stock/", json={"items": items})
+    assert response.status_code == 409
+    assert response.json()["detail"]["product_ids"] == [2]
+    assert await stock(1, 2) == {1: 10, 2: 10}
+
+
+@requires_postgresql
+async def test_adjust_stock_batch_reports_missing_ids(client):
+    items = [
+        {"product_id": 998, "delta": 1},
+        {"product_id": 3, "delta": 1},
+        {"product_id": 4, "delta": -20},
+        {"product_id": 997, "delta": 1},
+    ]
+    response = await client.post("/products/stock/", json={"items": items})
+    assert response.status_code == 409
+    assert response.json()["detail"] == {
+        "message": "Produto inexistente ou estoque insuficiente",
+        "product_ids": [4, 997, 998],
+    }
+    assert await stock(3, 4) == {3: 10, 4: 10}